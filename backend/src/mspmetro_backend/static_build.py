@@ -8,6 +8,7 @@ import re
 import socket
 import subprocess
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -15,7 +16,7 @@ from urllib.request import Request, urlopen
 from zoneinfo import ZoneInfo
 
 from sqlalchemy import desc
-from sqlalchemy import case
+from sqlalchemy import case, func, or_, select
 
 from .db import session
 from .models import Alert, AlertSeverity, Item, Source
@@ -23,6 +24,11 @@ from .text_clean import strip_markup_to_text
 
 
 CT_TZ = ZoneInfo("America/Chicago")
+_PUB_FMT = "%Y-%m-%d %H:%M %Z"
+# Always LF: os.linesep would mix "\r\n" into pages built on Windows.
+_NL = "\n"
+# Pages are streamed to disk piecewise; 64 KiB keeps the write syscalls few.
+_WRITE_BUFFER = 1 << 16
 _DENY_URLS_CACHE: set[str] | None = None
 
 
@@ -118,23 +124,38 @@ def _day_full(dt: datetime) -> str:
     return _to_ct(dt).strftime("%A")
 
 
-def _rel_time(dt: datetime | None, *, now: datetime) -> str:
-    if not dt:
-        return "Updated recently"
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    delta = now - dt
-    seconds = max(int(delta.total_seconds()), 0)
+def _rel_label(seconds: int) -> str:
     minutes = seconds // 60
-    hours = minutes // 60
-    days = hours // 24
     if minutes < 2:
         return "Updated just now"
     if minutes < 60:
         return f"Updated {minutes} minutes ago"
+    hours = minutes // 60
     if hours < 24:
         return f"Updated {hours} hours ago"
-    return f"Updated {days} days ago"
+    return f"Updated {hours // 24} days ago"
+
+
+def _rel_time(dt: datetime | None, *, now: datetime) -> str:
+    if not dt:
+        return "Updated recently"
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return _rel_label(max(int((now - dt).total_seconds()), 0))
+
+
+def _rel_time_many(
+    timestamps: list[datetime | None], *, now: datetime, missing: str = "Updated recently"
+) -> list[str]:
+    out: list[str] = []
+    for dt in timestamps:
+        if not dt:
+            out.append(missing)
+            continue
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        out.append(_rel_label(max(int((now - dt).total_seconds()), 0)))
+    return out
 
 
 def _slugify(s: str) -> str:
@@ -598,36 +619,133 @@ def _item_when(it: Item) -> datetime | None:
     return it.updated_at or it.published_at or it.ingested_at
 
 
-def _load_items_for_sources(
+def _item_order() -> tuple:
+    return (desc(Item.published_at).nullslast(), desc(Item.ingested_at))
+
+
+def _age_filter(max_age_days: int, *, now: datetime):
+    cutoff = now - timedelta(days=int(max_age_days))
+    return (Item.published_at.is_not(None) & (Item.published_at >= cutoff)) | (Item.ingested_at >= cutoff)
+
+
+def _within_age(it: Item, max_age_days: int, *, now: datetime) -> bool:
+    cutoff = now - timedelta(days=int(max_age_days))
+    if it.published_at is not None and it.published_at >= cutoff:
+        return True
+    return it.ingested_at is not None and it.ingested_at >= cutoff
+
+
+def _load_items_by_section(
     db,
-    source_names: tuple[str, ...],
+    sections: tuple[SectionDef, ...],
     *,
     limit: int,
     now: datetime,
-    max_age_days: int | None = None,
-) -> list[tuple[Item, Source]]:
-    if not source_names:
-        return []
-    deny_urls = _load_denylist_urls()
-    q = (
+) -> dict[str, list[tuple[Item, Source]]]:
+    """Load the newest items for every section in a single query.
+
+    A ROW_NUMBER() window keeps the top ``limit * 3`` rows per source (headroom
+    for denylisted URLs), which always covers each section's own top rows.
+    """
+    out: dict[str, list[tuple[Item, Source]]] = {sec.key: [] for sec in sections}
+    conds = []
+    for sec in sections:
+        if not sec.source_names:
+            continue
+        cond = Source.name.in_(list(sec.source_names))
+        if sec.max_age_days is not None:
+            cond = cond & _age_filter(sec.max_age_days, now=now)
+        conds.append(cond)
+    if not conds:
+        return out
+
+    rn = func.row_number().over(partition_by=Item.source_id, order_by=_item_order()).label("rn")
+    ranked = (
+        select(Item.id.label("item_id"), rn)
+        .join(Source, Source.id == Item.source_id)
+        .where(or_(*conds))
+        .subquery()
+    )
+    rows = (
         db.query(Item, Source)
         .join(Source, Source.id == Item.source_id)
-        .filter(Source.name.in_(list(source_names)))
+        .join(ranked, ranked.c.item_id == Item.id)
+        .filter(ranked.c.rn <= limit * 3)
+        .order_by(*_item_order())
+        .all()
     )
-    if max_age_days is not None:
-        cutoff = now - timedelta(days=int(max_age_days))
-        q = q.filter((Item.published_at.is_not(None) & (Item.published_at >= cutoff)) | (Item.ingested_at >= cutoff))
-    q = q.order_by(desc(Item.published_at).nullslast(), desc(Item.ingested_at))
-    rows = q.limit(limit * 3).all()
-    if not deny_urls:
-        return rows[:limit]
-    out: list[tuple[Item, Source]] = []
-    for it, src in rows:
-        if it.canonical_url and _normalize_url(it.canonical_url) in deny_urls:
+
+    deny_urls = _load_denylist_urls()
+    for sec in sections:
+        if not sec.source_names:
+            continue
+        names = set(sec.source_names)
+        picked = out[sec.key]
+        for it, src in rows:
+            if src.name not in names:
+                continue
+            if sec.max_age_days is not None and not _within_age(it, sec.max_age_days, now=now):
+                continue
+            if deny_urls and it.canonical_url and _normalize_url(it.canonical_url) in deny_urls:
+                continue
+            picked.append((it, src))
+            if len(picked) >= limit:
+                break
+    return out
+
+
+@dataclass(frozen=True)
+class PreparedItem:
+    """One item with every string the renderers need, already cleaned and escaped."""
+
+    rank: int
+    anchor: str
+    title: str
+    title_e: str
+    dek_e: str
+    meta_e: str
+    body_e: str
+    affects: tuple[str, ...]
+    affects_e: str
+    published_e: str
+    src_name: str
+    src_name_e: str
+    url: str | None
+    url_e: str
+
+
+def _prepare_rows(rows: list[tuple[Item, Source]], *, now: datetime) -> list[PreparedItem]:
+    whens = [_item_when(it) for it, _src in rows]
+    updated_lines = _rel_time_many(whens, now=now, missing="Updated today")
+    out: list[PreparedItem] = []
+    for rank, ((it, src), when, item_updated) in enumerate(zip(rows, whens, updated_lines)):
+        title = _clean_title(it.title)
+        if not title:
             continue
-        out.append((it, src))
-        if len(out) >= limit:
-            break
+        summary = _clean_feed_snippet(it.summary or "")
+        content = _clean_feed_snippet(it.content_text or "")
+        affects = tuple(_affects_from_title(title))
+        affects_joined = " · ".join(affects)
+        affects_txt = f"Affects: {affects_joined} · " if affects else ""
+        out.append(
+            PreparedItem(
+                rank=rank,
+                # Top 40 bits == id.hex[:10], without building the 32-char hex string.
+                anchor=f"i-{it.id.int >> 88:010x}",
+                title=title,
+                title_e=_escape(title),
+                dek_e=_escape(summary or content),
+                meta_e=_escape(f"{affects_txt}{item_updated}"),
+                body_e=_escape(content or summary or "Brief summary unavailable in feed."),
+                affects=affects,
+                affects_e=_escape(affects_joined),
+                published_e=_escape(_to_ct(when).strftime(_PUB_FMT) if when else ""),
+                src_name=src.name,
+                src_name_e=_escape(src.name),
+                url=it.canonical_url,
+                url_e=_escape(it.canonical_url),
+            )
+        )
     return out
 
 
@@ -807,8 +925,21 @@ def _footer(*, root_prefix: str, build_meta: BuildMeta) -> str:
 """
 
 
-def _render_frontpage(db, *, out_dir: Path, now: datetime, build_meta: BuildMeta) -> None:
+def _render_frontpage(
+    db,
+    *,
+    prepared: dict[str, list[PreparedItem]],
+    out_dir: Path,
+    now: datetime,
+    build_meta: BuildMeta,
+) -> None:
+    # Hot-loop aliases: locals instead of global lookups / repeated calls.
+    esc = _escape
+    arrow_i = _arrow_internal()
+    arrow_e = _arrow_external()
+
     alerts = _load_active_alerts(db, limit=3, now=now)
+
     alert_list_hidden_attr = "" if alerts else " hidden"
 
     alert_items = []
@@ -818,13 +949,13 @@ def _render_frontpage(db, *, out_dir: Path, now: datetime, build_meta: BuildMeta
         title = (a.title or "").strip() or "Alert"
         body = (a.body or "").strip()
         summary = body.splitlines()[0].strip() if body else ""
-        line = _escape(summary or title)
+        line = esc(summary or title)
         source_label = "Source: National Weather Service (Tier 1)"
         alert_items.append(
             f"""          <li>
-            <span class="alert-pill" data-severity="{_escape(sev)}">{_escape(pill)}</span>
+            <span class="alert-pill" data-severity="{esc(sev)}">{esc(pill)}</span>
             {line}
-            <span class="alert-source">{_escape(source_label)}</span>
+            <span class="alert-source">{esc(source_label)}</span>
           </li>"""
         )
 
@@ -832,18 +963,19 @@ def _render_frontpage(db, *, out_dir: Path, now: datetime, build_meta: BuildMeta
     picks_html = []
 
     for sec in SECTIONS:
-        items = _load_items_for_sources(db, sec.source_names, limit=6, now=now, max_age_days=sec.max_age_days)
-        top_items = items[:3]
+        # Ranks index the section's loaded rows, so titleless rows still count
+        # toward the top 3 / top 4 exactly as on the section page.
+        sec_items = prepared.get(sec.key, [])
         list_items = []
-        for item, _src in top_items:
-            title = _clean_title(item.title)
-            if not title or not item.canonical_url:
+        for p in sec_items:
+            if p.rank >= 3:
+                break
+            if not p.url:
                 continue
-            anchor = f"i-{item.id.hex[:10]}"
-            href = _site_href(f"{sec.page_path}#{anchor}", root_prefix="")
+            href = _site_href(f"{sec.page_path}#{p.anchor}", root_prefix="")
             list_items.append(
                 f"""              <li>
-                <a href="{_escape(href)}">{_escape(title)} {_arrow_internal()}</a>
+                <a href="{esc(href)}">{p.title_e} {arrow_i}</a>
               </li>"""
             )
 
@@ -851,13 +983,13 @@ def _render_frontpage(db, *, out_dir: Path, now: datetime, build_meta: BuildMeta
             list_items.extend(
                 [
                     f"""              <li>
-                <a href="{_escape(_site_href(sec.page_path, root_prefix=''))}">World briefing {_arrow_internal()}</a>
+                <a href="{esc(_site_href(sec.page_path, root_prefix=''))}">World briefing {arrow_i}</a>
               </li>""",
                     f"""              <li>
-                <a href="https://www.npr.org/sections/world/" rel="external noopener noreferrer">NPR World {_arrow_external()}</a>
+                <a href="https://www.npr.org/sections/world/" rel="external noopener noreferrer">NPR World {arrow_e}</a>
               </li>""",
                     f"""              <li>
-                <a href="https://www.bbc.com/news/world" rel="external noopener noreferrer">BBC World {_arrow_external()}</a>
+                <a href="https://www.bbc.com/news/world" rel="external noopener noreferrer">BBC World {arrow_e}</a>
               </li>""",
                 ]
             )
@@ -865,20 +997,20 @@ def _render_frontpage(db, *, out_dir: Path, now: datetime, build_meta: BuildMeta
             list_items.extend(
                 [
                     f"""              <li>
-                <a href="{_escape(_site_href(sec.page_path, root_prefix=''))}">Today and this weekend {_arrow_internal()}</a>
+                <a href="{esc(_site_href(sec.page_path, root_prefix=''))}">Today and this weekend {arrow_i}</a>
               </li>""",
                     f"""              <li>
-                <a href="https://www.minneapolis.org/calendar/" rel="external noopener noreferrer">Minneapolis calendar {_arrow_external()}</a>
+                <a href="https://www.minneapolis.org/calendar/" rel="external noopener noreferrer">Minneapolis calendar {arrow_e}</a>
               </li>""",
                     f"""              <li>
-                <a href="https://www.visitsaintpaul.com/events/" rel="external noopener noreferrer">Saint Paul events {_arrow_external()}</a>
+                <a href="https://www.visitsaintpaul.com/events/" rel="external noopener noreferrer">Saint Paul events {arrow_e}</a>
               </li>""",
                 ]
             )
         elif not list_items:
             list_items.append(
                 f"""              <li>
-                <a href="{_escape(_site_href(sec.page_path, root_prefix=''))}">Open {_escape(sec.label)} {_arrow_internal()}</a>
+                <a href="{esc(_site_href(sec.page_path, root_prefix=''))}">Open {esc(sec.label)} {arrow_i}</a>
               </li>"""
             )
 
@@ -886,39 +1018,36 @@ def _render_frontpage(db, *, out_dir: Path, now: datetime, build_meta: BuildMeta
         header_html = (
             f'<h2 class="kicker" id="{sec.key}-title">{header}</h2>'
             if sec.key == "weather"
-            else f'<h2 class="kicker" id="{sec.key}-title"><a href="{_escape(_site_href(sec.page_path, root_prefix=""))}">{header} {_arrow_internal()}</a></h2>'
+            else f'<h2 class="kicker" id="{sec.key}-title"><a href="{esc(_site_href(sec.page_path, root_prefix=""))}">{header} {arrow_i}</a></h2>'
         )
 
         cards_html.append(
             f"""          <section id="{sec.key}" class="card" aria-labelledby="{sec.key}-title">
             {header_html}
             <ul class="link-list">
-{os.linesep.join(list_items)}
+{_NL.join(list_items)}
             </ul>
-            <a class="see-all" href="{_escape(_site_href(sec.page_path, root_prefix=''))}">SEE ALL {_arrow_internal()}</a>
+            <a class="see-all" href="{esc(_site_href(sec.page_path, root_prefix=''))}">SEE ALL {arrow_i}</a>
           </section>"""
         )
 
         # Picks: only story/event picks (no Weather/Transit, and no Metro).
         # Use 4 items where possible for a richer "this looks interesting" scan.
         if sec.key in {"neighbors", "events"}:
-            pick_items = items[:4]
+            pick_items = [p for p in sec_items if p.rank < 4]
             if pick_items:
                 pick_li = []
-                for item, src in pick_items:
-                    title = _clean_title(item.title)
-                    if not title or not item.canonical_url:
+                for p in pick_items:
+                    if not p.url:
                         continue
-                    anchor = f"i-{item.id.hex[:10]}"
-                    href = _site_href(f"{sec.page_path}#{anchor}", root_prefix="")
-                    note = f"From {src.name}"
-                    affects = _affects_from_title(title)
-                    if affects:
-                        note = f"Affects: {' · '.join(affects)}"
+                    href = _site_href(f"{sec.page_path}#{p.anchor}", root_prefix="")
+                    note = f"From {p.src_name}"
+                    if p.affects:
+                        note = f"Affects: {' · '.join(p.affects)}"
                     pick_li.append(
                         f"""              <li>
-                <a href="{_escape(href)}">{_escape(title)} {_arrow_internal()}</a>
-                <span class="pick-note">{_escape(note)}.</span>
+                <a href="{esc(href)}">{p.title_e} {arrow_i}</a>
+                <span class="pick-note">{esc(note)}.</span>
               </li>"""
                     )
                 if pick_li:
@@ -926,7 +1055,7 @@ def _render_frontpage(db, *, out_dir: Path, now: datetime, build_meta: BuildMeta
                         f"""          <section class="card card--pick" aria-labelledby="pick-{sec.key}-title">
             <h3 class="kicker" id="pick-{sec.key}-title">{sec.key.upper()}</h3>
             <ul class="link-list">
-{os.linesep.join(pick_li)}
+{_NL.join(pick_li)}
             </ul>
           </section>"""
                     )
@@ -937,25 +1066,25 @@ def _render_frontpage(db, *, out_dir: Path, now: datetime, build_meta: BuildMeta
             <ul class="link-list">
               <li>
                 <a href="https://www.minneapolis.org/calendar/" rel="external noopener noreferrer">Minneapolis calendar """
-                    + _arrow_external()
+                    + arrow_e
                     + """</a>
                 <span class="pick-note">A quick scan for tonight.</span>
               </li>
               <li>
                 <a href="https://www.visitsaintpaul.com/events/" rel="external noopener noreferrer">Saint Paul events """
-                    + _arrow_external()
+                    + arrow_e
                     + """</a>
                 <span class="pick-note">Useful if weather changes plans.</span>
               </li>
               <li>
                 <a href="https://www.walkerart.org/calendar/" rel="external noopener noreferrer">Walker Art Center """
-                    + _arrow_external()
+                    + arrow_e
                     + """</a>
                 <span class="pick-note">Museum + film listings.</span>
               </li>
               <li>
                 <a href="https://first-avenue.com/shows/" rel="external noopener noreferrer">First Avenue shows """
-                    + _arrow_external()
+                    + arrow_e
                     + """</a>
                 <span class="pick-note">Live music planning.</span>
               </li>
@@ -970,25 +1099,25 @@ def _render_frontpage(db, *, out_dir: Path, now: datetime, build_meta: BuildMeta
             <ul class="link-list">
               <li>
                 <a href="https://www.npr.org/sections/world/" rel="external noopener noreferrer">NPR World """
-        + _arrow_external()
+        + arrow_e
         + """</a>
                 <span class="pick-note">A fast scan for high-impact developments.</span>
               </li>
               <li>
                 <a href="https://www.bbc.com/news/world" rel="external noopener noreferrer">BBC World """
-        + _arrow_external()
+        + arrow_e
         + """</a>
                 <span class="pick-note">Useful background if something breaks late.</span>
               </li>
               <li>
                 <a href="https://apnews.com/world-news" rel="external noopener noreferrer">AP World """
-        + _arrow_external()
+        + arrow_e
         + """</a>
                 <span class="pick-note">Straight reporting, quick headlines.</span>
               </li>
               <li>
                 <a href="https://www.reuters.com/world/" rel="external noopener noreferrer">Reuters World """
-        + _arrow_external()
+        + arrow_e
         + """</a>
                 <span class="pick-note">Markets and geopolitics signal.</span>
               </li>
@@ -998,17 +1127,9 @@ def _render_frontpage(db, *, out_dir: Path, now: datetime, build_meta: BuildMeta
 
     # What changed: count items in last 2 hours.
     recent_cutoff = now - timedelta(hours=2)
-    recent_items = db.query(Item).filter(Item.ingested_at >= recent_cutoff).count()
+    recent_items = db.query(func.count(Item.id)).filter(Item.ingested_at >= recent_cutoff).scalar() or 0
 
-    doc = (
-        _doc_head(
-            root_prefix="",
-            title="MSPMetro — Daily",
-            description="A calm, accessible daily dashboard for news, transit, weather, and events.",
-        )
-        + _orientation_block(now=now, root_prefix="")
-        + _top_nav(is_frontpage=True, root_prefix="")
-        + f"""
+    main_html = f"""
     <main id="main" class="wrap" tabindex="-1">
       <h1 class="sr-only">MSPMetro Daily Dashboard</h1>
 
@@ -1028,7 +1149,7 @@ def _render_frontpage(db, *, out_dir: Path, now: datetime, build_meta: BuildMeta
         <section class="alerts" aria-live="polite" aria-atomic="true">
           <h2 class="kicker" id="alerts-title">ALERTS</h2>
           <ul class="alert-list" aria-labelledby="alerts-title"{alert_list_hidden_attr}>
-{os.linesep.join(alert_items)}
+{_NL.join(alert_items)}
           </ul>
           <p class="empty-state">No current alerts or disruptions</p>
         </section>
@@ -1055,33 +1176,54 @@ def _render_frontpage(db, *, out_dir: Path, now: datetime, build_meta: BuildMeta
 
       <section id="summary" aria-label="Summary">
         <div class="grid" aria-label="Daily sections">
-{os.linesep.join(cards_html)}
+{_NL.join(cards_html)}
         </div>
       </section>
 
       <section class="sampling" aria-labelledby="picks-title">
         <h2 class="kicker" id="picks-title">PICKS</h2>
         <div class="grid" aria-label="Quick picks by section">
-{os.linesep.join(picks_html)}
+{_NL.join(picks_html)}
         </div>
       </section>
 
-      <p class="what-changed" id="what-changed">Updated recently: {_escape(str(recent_items))} items</p>
+      <p class="what-changed" id="what-changed">Updated recently: {esc(str(recent_items))} items</p>
     </main>
 """
-        + _footer(root_prefix="", build_meta=build_meta)
-        + _doc_foot()
-    )
 
-    (out_dir / "index.html").write_text(doc, encoding="utf-8")
+    with (out_dir / "index.html").open("w", encoding="utf-8", newline="\n", buffering=_WRITE_BUFFER) as f:
+        f.write(
+            _doc_head(
+                root_prefix="",
+                title="MSPMetro — Daily",
+                description="A calm, accessible daily dashboard for news, transit, weather, and events.",
+            )
+        )
+        f.write(_orientation_block(now=now, root_prefix=""))
+        f.write(_top_nav(is_frontpage=True, root_prefix=""))
+        f.write(main_html)
+        f.write(_footer(root_prefix="", build_meta=build_meta))
+        f.write(_doc_foot())
+
 
+def _render_section_page(
+    *,
+    sec: SectionDef,
+    rows: list[tuple[Item, Source]],
+    prepared: list[PreparedItem],
+    out_dir: Path,
+    now: datetime,
+    build_meta: BuildMeta,
+) -> None:
+    # Hot-loop aliases: locals instead of global lookups / repeated calls.
+    esc = _escape
+    arrow_i = _arrow_internal()
+    arrow_e = _arrow_external()
 
-def _render_section_page(db, *, sec: SectionDef, out_dir: Path, now: datetime, build_meta: BuildMeta) -> None:
     out_path = out_dir / sec.key / "index.html"
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if sec.source_names:
-        rows = _load_items_for_sources(db, sec.source_names, limit=40, now=now, max_age_days=sec.max_age_days)
+    if rows:
         newest = None
         for it, _ in rows:
             newest = it.updated_at or it.published_at or it.ingested_at
@@ -1089,60 +1231,43 @@ def _render_section_page(db, *, sec: SectionDef, out_dir: Path, now: datetime, b
                 break
         updated_line = _rel_time(newest, now=now) if newest else "Updated today"
     else:
-        rows = []
         updated_line = "Updated today"
 
     index_items = []
     detail_items = []
 
-    for it, src in rows[:25]:
-        title = _clean_title(it.title)
-        if not title:
-            continue
-        anchor = f"i-{it.id.hex[:10]}"
-        dek = _clean_feed_snippet(it.summary or "") or _clean_feed_snippet(it.content_text or "") or ""
-        affects = _affects_from_title(title)
-        affects_txt = f"Affects: {' · '.join(affects)} · " if affects else ""
-        item_when = _item_when(it)
-        item_updated = _rel_time(item_when, now=now) if item_when else "Updated today"
-        meta = f"{affects_txt}{item_updated}"
+    for p in prepared:
         index_items.append(
             f"""          <li>
-            <a href="#{_escape(anchor)}">{_escape(title)} {_arrow_internal()}</a>
-            <p class="dek">{_escape(dek)}</p>
-            <p class="meta-line">{_escape(meta)} · {_escape(src.name)}</p>
+            <a href="#{p.anchor}">{p.title_e} {arrow_i}</a>
+            <p class="dek">{p.dek_e}</p>
+            <p class="meta-line">{p.meta_e} · {p.src_name_e}</p>
           </li>"""
         )
 
-        body_p1 = _clean_feed_snippet(it.content_text or "") or _clean_feed_snippet(it.summary or "") or "Brief summary unavailable in feed."
-        body_p2 = "Use the source link for full context and verification."
-
         src_link = ""
-        if it.canonical_url:
+        if p.url:
             src_link = (
                 f"""          <p class="source">
             <span class="meta-label">Source:</span>
-            <a href="{_escape(it.canonical_url)}" rel="external noopener noreferrer">{_escape(src.name)} {_arrow_external()}</a>
+            <a href="{p.url_e}" rel="external noopener noreferrer">{p.src_name_e} {arrow_e}</a>
           </p>"""
             )
 
         affects_line = ""
-        if affects:
-            affects_line = f"""          <p class="meta-line"><span class="meta-label">Affects:</span> {_escape(" · ".join(affects))}</p>"""
-
-        published = _item_when(it)
-        published_line = _to_ct(published).strftime("%Y-%m-%d %H:%M %Z") if published else ""
+        if p.affects:
+            affects_line = f"""          <p class="meta-line"><span class="meta-label">Affects:</span> {p.affects_e}</p>"""
 
         detail_items.append(
-            f"""        <article id="{_escape(anchor)}" class="article-detail">
-          <h2>{_escape(title)}</h2>
-          <p>{_escape(body_p1)}</p>
-          <p>{_escape(body_p2)}</p>
+            f"""        <article id="{p.anchor}" class="article-detail">
+          <h2>{p.title_e}</h2>
+          <p>{p.body_e}</p>
+          <p>Use the source link for full context and verification.</p>
 {affects_line}
-          <p class="meta-line"><span class="meta-label">Published:</span> {_escape(published_line)}</p>
+          <p class="meta-line"><span class="meta-label">Published:</span> {p.published_e}</p>
 {src_link}
           <p class="back">
-            <a href="#index">Back to index {_arrow_internal()}</a>
+            <a href="#index">Back to index {arrow_i}</a>
           </p>
         </article>"""
         )
@@ -1166,19 +1291,15 @@ def _render_section_page(db, *, sec: SectionDef, out_dir: Path, now: datetime, b
     title = f"MSPMetro — {sec.label}"
     desc = f"{sec.label} briefing: daily civic updates."
 
-    doc = (
-        _doc_head(root_prefix="../", title=title, description=desc)
-        + _orientation_block(now=now, root_prefix="../")
-        + _top_nav(is_frontpage=False, root_prefix="../")
-        + f"""
+    main_html = f"""
     <main id="main" class="wrap" tabindex="-1">
       <nav class="breadcrumbs" aria-label="Breadcrumb">
         <a href="../">Daily briefing</a>
       </nav>
 
       <header class="section-header">
-        <h1>{_escape(sec.label)}</h1>
-        <p class="section-meta">{_escape(updated_line)}</p>
+        <h1>{esc(sec.label)}</h1>
+        <p class="section-meta">{esc(updated_line)}</p>
       </header>
 
       <section class="briefing" aria-label="Section brief">
@@ -1202,23 +1323,26 @@ def _render_section_page(db, *, sec: SectionDef, out_dir: Path, now: datetime, b
       <section id="index" class="index-block" aria-label="Article index">
         <h2 class="kicker" id="index-title">ARTICLES</h2>
         <ul class="article-index" aria-labelledby="index-title">
-{os.linesep.join(index_items)}
+{_NL.join(index_items)}
         </ul>
       </section>
 
       <section class="details" aria-label="Article details">
-{os.linesep.join(detail_items)}
+{_NL.join(detail_items)}
         <p class="back">
           <a href="#top">Back to top <span class="arrow" aria-hidden="true">↑</span></a>
         </p>
       </section>
     </main>
 """
-        + _footer(root_prefix="../", build_meta=build_meta)
-        + _doc_foot()
-    )
 
-    out_path.write_text(doc, encoding="utf-8")
+    with out_path.open("w", encoding="utf-8", newline="\n", buffering=_WRITE_BUFFER) as f:
+        f.write(_doc_head(root_prefix="../", title=title, description=desc))
+        f.write(_orientation_block(now=now, root_prefix="../"))
+        f.write(_top_nav(is_frontpage=False, root_prefix="../"))
+        f.write(main_html)
+        f.write(_footer(root_prefix="../", build_meta=build_meta))
+        f.write(_doc_foot())
 
 
 def build_site(*, out_dir: Path) -> None:
@@ -1226,10 +1350,27 @@ def build_site(*, out_dir: Path) -> None:
     now = _now()
     build_meta = _build_metadata()
 
+    # The front page renders first so the orientation cache is warm before the
+    # section pages fan out. Section rows are prefetched, so workers never touch
+    # the (non-thread-safe) session.
     with session() as db:
-        _render_frontpage(db, out_dir=out_dir, now=now, build_meta=build_meta)
-        for sec in SECTIONS:
-            _render_section_page(db, sec=sec, out_dir=out_dir, now=now, build_meta=build_meta)
+        items_by_section = _load_items_by_section(db, SECTIONS, limit=40, now=now)
+        # Clean/escape each section's rows once; the front page reuses them.
+        prepared = {key: _prepare_rows(rows[:25], now=now) for key, rows in items_by_section.items()}
+        _render_frontpage(db, prepared=prepared, out_dir=out_dir, now=now, build_meta=build_meta)
+
+    def _render_one(sec: SectionDef) -> None:
+        _render_section_page(
+            sec=sec,
+            rows=items_by_section.get(sec.key, []),
+            prepared=prepared.get(sec.key, []),
+            out_dir=out_dir,
+            now=now,
+            build_meta=build_meta,
+        )
+
+    with ThreadPoolExecutor(max_workers=min(8, len(SECTIONS))) as pool:
+        list(pool.map(_render_one, SECTIONS))
     _write_health_file(out_dir=out_dir, build_meta=build_meta)
 
 
@@ -22,6 +22,9 @@ _ATTR_GARBAGE_RE = re.compile(
     """
 )
 _WP_IMG_GARBAGE_RE = re.compile(r"(?i)\b(?:wp-post-image|attachment-rss-image-size|size-rss-image-size)\b")
+_DANGLING_TAG_RE = re.compile(r"<[^\n]*$")
+_WHITESPACE_RE = re.compile(r"\s+")
+_DROP_CATEGORIES = frozenset({"Cc", "Cf"})
 
 
 def strip_markup_to_text(s: str) -> str:
@@ -35,7 +38,7 @@ def strip_markup_to_text(s: str) -> str:
     # Remove HTML tags (best-effort).
     s = _WELL_FORMED_TAG_RE.sub(" ", s)
     # Remove dangling tag fragments that never close.
-    s = re.sub(r"<[^\n]*$", " ", s)
+    s = _DANGLING_TAG_RE.sub(" ", s)
     s = _TAG_FRAGMENT_RE.sub(" ", s)
     # If any angle brackets remain, they should never reach the user.
     s = s.replace("<", " ").replace(">", " ")
@@ -46,8 +49,10 @@ def strip_markup_to_text(s: str) -> str:
     s = _WP_IMG_GARBAGE_RE.sub(" ", s)
 
     # Drop control/format characters (e.g., zero-width joiners, bidi marks).
-    s = "".join(ch for ch in s if unicodedata.category(ch) not in {"Cc", "Cf"})
+    # Cc/Cf are never printable, so the per-character scan only runs when needed.
+    if not s.isprintable():
+        s = "".join(ch for ch in s if unicodedata.category(ch) not in _DROP_CATEGORIES)
     # Replace a few common "bad decode" sentinels.
     s = s.replace("\ufffd", " ").replace("\ufffc", " ")
 
-    return re.sub(r"\s+", " ", s).strip()
+    return _WHITESPACE_RE.sub(" ", s).strip()
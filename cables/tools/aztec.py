@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
 import base64
+import struct
+import zlib
 from dataclasses import dataclass
 from pathlib import Path
 
 
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Level 9 buys nothing on these tiny bilevel images (it is often larger than 6).
+PNG_COMPRESS_LEVEL = 6
+
+
 class AztecError(RuntimeError):
     pass
 
@@ -17,7 +24,7 @@ class AztecPng:
         return f"data:image/png;base64,{b64}"
 
 
-def render_aztec_png(payload: str, *, module_size: int = 6) -> AztecPng:
+def _aztec_matrix(payload: str) -> list[list[bool]]:
     try:
         from aztec_code_generator import AztecCode  # type: ignore
     except Exception as exc:  # pragma: no cover
@@ -25,45 +32,75 @@ def render_aztec_png(payload: str, *, module_size: int = 6) -> AztecPng:
             "Aztec encoder library missing; run `make -C cables setup` to install dependencies."
         ) from exc
 
-    try:
-        from PIL import Image  # type: ignore
-    except Exception as exc:  # pragma: no cover
-        raise AztecError("Pillow missing; run `make -C cables setup`.") from exc
-
     code = AztecCode(payload)
     matrix = code.matrix
 
     if not matrix or not matrix[0]:
         raise AztecError("Aztec encoder produced an empty matrix")
 
-    height = len(matrix)
     width = len(matrix[0])
-
-    img = Image.new("1", (width, height), 1)
-    for y in range(height):
-        row = matrix[y]
+    for row in matrix:
         if len(row) != width:
             raise AztecError("Aztec matrix is not rectangular")
-        for x in range(width):
-            img.putpixel((x, y), 0 if row[x] else 1)
+    return matrix
 
-    if module_size > 1:
-        img = img.resize((width * module_size, height * module_size), resample=Image.NEAREST)
 
-    out = _encode_png(img)
-    return AztecPng(png_bytes=out)
+def render_aztec_png(
+    payload: str, *, module_size: int = 6, compress_level: int = PNG_COMPRESS_LEVEL
+) -> AztecPng:
+    """Render an Aztec code as a 1-bit grayscale PNG (no Pillow involved)."""
+    matrix = _aztec_matrix(payload)
+    png_bytes = _encode_png_1bit(matrix, module_size=module_size, compress_level=compress_level)
+    return AztecPng(png_bytes=png_bytes)
 
 
-def write_aztec_png(payload: str, out_path: Path, *, module_size: int = 6) -> None:
+def write_aztec_png(
+    payload: str, out_path: Path, *, module_size: int = 6, compress_level: int = PNG_COMPRESS_LEVEL
+) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    png = render_aztec_png(payload, module_size=module_size)
+    png = render_aztec_png(payload, module_size=module_size, compress_level=compress_level)
     out_path.write_bytes(png.png_bytes)
 
 
-def _encode_png(img) -> bytes:
-    import io
-
-    buf = io.BytesIO()
-    img.save(buf, format="PNG", optimize=True)
-    return buf.getvalue()
-
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    crc = zlib.crc32(tag + data) & 0xFFFFFFFF
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", crc)
+
+
+def _scaled_rows(matrix: list[list[bool]], *, module_size: int) -> tuple[int, int, list[bytes]]:
+    """Block-expand the matrix by module_size into bit-packed 1-bit rows.
+
+    Rows are MSB first with 0 for dark modules and 1 for light ones, padded
+    to a whole byte. Each matrix row is packed once and repeated.
+    """
+    if module_size < 1:
+        raise AztecError("module_size must be >= 1")
+
+    height = len(matrix) * module_size
+    width = len(matrix[0]) * module_size
+    row_bytes = (width + 7) // 8
+    pad = "0" * (row_bytes * 8 - width)
+
+    white = "1" * module_size
+    black = "0" * module_size
+    rows: list[bytes] = []
+    for row in matrix:
+        bits = "".join(black if cell else white for cell in row) + pad
+        rows.extend([int(bits, 2).to_bytes(row_bytes, "big")] * module_size)
+    return width, height, rows
+
+
+def _encode_png_1bit(matrix: list[list[bool]], *, module_size: int, compress_level: int) -> bytes:
+    width, height, rows = _scaled_rows(matrix, module_size=module_size)
+    raw = b"".join(b"\x00" + row for row in rows)
+
+    # Grayscale, bit depth 1, no interlace.
+    ihdr = struct.pack(">IIBBBBB", width, height, 1, 0, 0, 0, 0)
+    return b"".join(
+        [
+            PNG_SIGNATURE,
+            _png_chunk(b"IHDR", ihdr),
+            _png_chunk(b"IDAT", zlib.compress(raw, compress_level)),
+            _png_chunk(b"IEND", b""),
+        ]
+    )
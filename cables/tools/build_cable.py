@@ -2,15 +2,18 @@
 import argparse
 import hashlib
 import json
+import os
 import re
 import shutil
 import subprocess
 import sys
 import zipfile
-from dataclasses import asdict, dataclass
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 
 from lint_cable import (
     CableSource,
@@ -21,13 +24,16 @@ from lint_cable import (
     parse_and_lint_cable_markdown,
 )
 
-from aztec import AztecError, render_aztec_png, write_aztec_png
+from aztec import AztecError, AztecPng, render_aztec_png
 
 
 CANONICAL_BASE_URL = "https://www.mspmetro.com/cables"
 
 RE_SAFE_ASCII = re.compile(r"^[\x09\x0A\x0D\x20-\x7E]+$")
 
+# Tool sources feed the input digest so code changes invalidate cached builds.
+TOOL_SOURCES = tuple(Path(__file__).with_name(name) for name in ("build_cable.py", "lint_cable.py", "aztec.py"))
+
 
 class BuildError(RuntimeError):
     pass
@@ -45,16 +51,15 @@ class BuiltCable:
     html_path: str
     pdf_path: str
     aztec_payload: str
+    input_digest: str = ""
+    # The feed's <main> fragment, carried in memory from build_one; not persisted.
+    content_html: str = field(default="", repr=False, compare=False)
 
 
 def _fail(message: str) -> None:
     raise BuildError(message)
 
 
-def compute_sha256_hex_upper(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest().upper()
-
-
 def canonical_url_for_id(cable_id: str) -> str:
     return f"{CANONICAL_BASE_URL}/{cable_id}"
 
@@ -65,22 +70,32 @@ def microcode_line(*, cable_id: str, utc: str, sha256: str, sig: str) -> str:
     return line
 
 
-def _canonical_text_for_hash(source: CableSource) -> str:
-    pieces: list[str] = []
-    pieces.append(f"CABLE_ID:{source.cable_id}")
-    pieces.append(f"UTC:{source.utc}")
-    pieces.append(f"TITLE:{source.title}")
+def _canonical_pieces(source: CableSource) -> Iterator[str]:
+    yield f"CABLE_ID:{source.cable_id}"
+    yield f"UTC:{source.utc}"
+    yield f"TITLE:{source.title}"
     for name in REQUIRED_SECTIONS:
-        pieces.append(f"SECTION:{name}")
-        pieces.append(_normalized_text(source.sections[name]))
-    pieces.append("END")
-    text = "\n".join(pieces).strip() + "\n"
-    if not RE_SAFE_ASCII.fullmatch(text):
-        _fail("canonical text for hash is not strict ASCII")
-    return text
+        yield f"SECTION:{name}"
+        yield _normalized_text(source.sections[name])
+    yield "END"
+
+
+def compute_sha256_canonical(source: CableSource) -> str:
+    """SHA-256 (upper hex) of the canonical text: every piece followed by a newline."""
+    h = hashlib.sha256()
+    for piece in _canonical_pieces(source):
+        # isascii/isprintable are C-level scans; the regex only runs for pieces
+        # that contain newlines or tabs (i.e. section text).
+        if not piece.isascii() or not (piece.isprintable() or RE_SAFE_ASCII.fullmatch(piece)):
+            _fail("canonical text for hash is not strict ASCII")
+        h.update(piece.encode("ascii"))
+        h.update(b"\n")
+    return h.hexdigest().upper()
 
 
 def _normalized_text(lines: list[str]) -> str:
+    # Kept as a per-line loop: str.strip/startswith are C calls, and a re.M
+    # substitution over the joined text measured several times slower.
     out: list[str] = []
     for line in lines:
         stripped = line.strip()
@@ -99,18 +114,10 @@ def _extract_summary(source: CableSource) -> str:
     return text.splitlines()[0].strip() if text.strip() else ""
 
 
-def _html_escape(text: str) -> str:
-    return (
-        text.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&#39;")
-    )
-
-
-def _latex_escape(text: str) -> str:
-    replacements = {
+HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"})
+XML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+LATEX_ESCAPE_TABLE = str.maketrans(
+    {
         "\\": r"\textbackslash{}",
         "{": r"\{",
         "}": r"\}",
@@ -122,7 +129,15 @@ def _latex_escape(text: str) -> str:
         "^": r"\textasciicircum{}",
         "~": r"\textasciitilde{}",
     }
-    return "".join(replacements.get(ch, ch) for ch in text)
+)
+
+
+def _html_escape(text: str) -> str:
+    return text.translate(HTML_ESCAPE_TABLE)
+
+
+def _latex_escape(text: str) -> str:
+    return text.translate(LATEX_ESCAPE_TABLE)
 
 
 def _tex_breakable_hex(hex_text: str, *, group: int = 8) -> str:
@@ -137,10 +152,14 @@ def _tex_breakable_hex(hex_text: str, *, group: int = 8) -> str:
     return "".join(pieces)
 
 
+SECTION_HEADINGS_HTML = {name: f"<h2>{name}</h2>" for name in REQUIRED_SECTIONS}
+SECTION_HEADINGS_TEX = {name: rf"\noindent\textbf{{{name}}}\par" for name in REQUIRED_SECTIONS}
+
+
 def render_body_html(source: CableSource) -> str:
     blocks: list[str] = []
     for section in REQUIRED_SECTIONS:
-        blocks.append(f"<h2>{section}</h2>")
+        blocks.append(SECTION_HEADINGS_HTML[section])
         blocks.extend(_render_section_html(source.sections[section]))
     return "\n".join(blocks)
 
@@ -159,7 +178,7 @@ def _render_section_html(lines: list[str]) -> Iterable[str]:
 def render_body_tex(source: CableSource) -> str:
     pieces: list[str] = []
     for section in REQUIRED_SECTIONS:
-        pieces.append(rf"\noindent\textbf{{{section}}}\par")
+        pieces.append(SECTION_HEADINGS_TEX[section])
         pieces.append("")
         pieces.extend(_render_section_tex(source.sections[section]))
         pieces.append("")
@@ -230,23 +249,53 @@ def _parse_blocks(lines: list[str]) -> list[Block]:
     return blocks
 
 
+TEMPLATE_PLACEHOLDERS = {
+    "html": re.compile(r"\{\{ ([A-Za-z0-9_]+) \}\}"),
+    "tex": re.compile(r"\{\{\{([A-Za-z0-9_]+)\}\}\}"),
+}
+
+
+@lru_cache(maxsize=16)
+def _template_plan(template: str, style: str) -> tuple[tuple[tuple[str, str, str], ...], str]:
+    """Split a template once into (literal, key, raw placeholder) runs plus a tail."""
+    pattern = TEMPLATE_PLACEHOLDERS.get(style)
+    if pattern is None:
+        _fail(f"unknown template style: {style}")
+    runs: list[tuple[str, str, str]] = []
+    pos = 0
+    for m in pattern.finditer(template):
+        runs.append((template[pos : m.start()], m.group(1), m.group(0)))
+        pos = m.end()
+    return tuple(runs), template[pos:]
+
+
 def _render_template(template: str, mapping: dict[str, str], *, style: str) -> str:
-    out = template
-    if style == "html":
-        for key, value in mapping.items():
-            out = out.replace(f"{{{{ {key} }}}}", value)
-        return out
-    if style == "tex":
-        for key, value in mapping.items():
-            out = out.replace(f"{{{{{{{key}}}}}}}", value)
-        return out
-    _fail(f"unknown template style: {style}")
+    runs, tail = _template_plan(template, style)
+    out: list[str] = []
+    for literal, key, raw in runs:
+        out.append(literal)
+        # Unknown placeholders are left untouched.
+        out.append(mapping.get(key, raw))
+    out.append(tail)
+    return "".join(out)
 
 
 def _load_template(path: Path) -> str:
-    return path.read_text(encoding="utf-8")
+    # Keyed on mtime so edits are picked up; returning the same str object also
+    # keeps _template_plan lookups cheap (str caches its hash).
+    return _read_template(str(path), path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=16)
+def _read_template(path: str, mtime_ns: int) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
 
-def _run_latex(*, engine: str, workdir: Path, tex_path: Path) -> None:
+# Flags that skip PDF output on a pass that only exists to produce the .aux.
+DRAFT_FLAGS = {"lualatex": "-draftmode", "pdflatex": "-draftmode", "xelatex": "-no-pdf"}
+
+
+def _run_latex(*, engine: str, workdir: Path, tex_path: Path, draft: bool = False) -> None:
     if engine not in {"lualatex", "pdflatex", "xelatex"}:
         _fail("unknown LaTeX engine")
     if shutil.which(engine) is None:
@@ -256,6 +305,7 @@ def _run_latex(*, engine: str, workdir: Path, tex_path: Path) -> None:
         engine,
         "-interaction=nonstopmode",
         "-halt-on-error",
+        *([DRAFT_FLAGS[engine]] if draft else []),
         "-output-directory",
         str(workdir),
         str(tex_path),
@@ -265,14 +315,78 @@ def _run_latex(*, engine: str, workdir: Path, tex_path: Path) -> None:
         _fail(f"{engine} failed:\n{proc.stdout}")
 
 
-def build_one(md_path: Path, *, repo_root: Path, engine: str) -> BuiltCable:
+def _run_tectonic(*, workdir: Path, tex_path: Path) -> None:
+    if shutil.which("tectonic") is None:
+        _fail("LaTeX engine not found on PATH: tectonic")
+    # Tectonic reruns internally until references settle, so one call suffices.
+    cmd = ["tectonic", "--keep-logs", "-o", str(workdir), str(tex_path)]
+    proc = subprocess.run(cmd, cwd=workdir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    if proc.returncode != 0:
+        _fail(f"tectonic failed:\n{proc.stdout}")
+
+
+def _effective_engine(engine: str) -> str:
+    # Resolved once in main(), before any input digest, so a pdflatex fallback build
+    # isn't reused as a tectonic one once tectonic is installed.
+    if engine == "tectonic" and shutil.which("tectonic") is None:
+        print("tectonic not found on PATH; falling back to pdflatex", file=sys.stderr)
+        return "pdflatex"
+    return engine
+
+
+def _typeset_pdf(*, engine: str, workdir: Path, tex_path: Path) -> None:
+    if engine == "tectonic":
+        _run_tectonic(workdir=workdir, tex_path=tex_path)
+        return
+
+    # The first pass only resolves references; the second one writes the PDF.
+    _run_latex(engine=engine, workdir=workdir, tex_path=tex_path, draft=True)
+    _run_latex(engine=engine, workdir=workdir, tex_path=tex_path)
+
+
+@lru_cache(maxsize=None)
+def _render_aztec_cached(payload: str, *, module_size: int = 6) -> AztecPng:
+    return render_aztec_png(payload, module_size=module_size)
+
+
+def _input_digest(markdown: str, *, repo_root: Path, engine: str) -> str:
+    templates_dir = repo_root / "cables" / "templates"
+    h = hashlib.sha256()
+    h.update(markdown.encode("utf-8"))
+    h.update(b"\0" + engine.encode("ascii"))
+    for path in (templates_dir / "cable.html", templates_dir / "cable.tex", *TOOL_SOURCES):
+        h.update(b"\0" + path.read_bytes())
+    return h.hexdigest()
+
+
+def _cached_build(cable_id: str, *, repo_root: Path, input_digest: str) -> BuiltCable | None:
+    build_dir = repo_root / "cables" / "build"
+    try:
+        data = json.loads((build_dir / "manifest" / f"{cable_id}.json").read_text(encoding="utf-8"))
+        if data.get("input_digest") != input_digest:
+            return None
+        cached = BuiltCable(**data)
+    except (OSError, ValueError, TypeError):
+        return None
+    outputs = (repo_root / cached.html_path, repo_root / cached.pdf_path, build_dir / "aztec" / f"{cable_id}.png")
+    if not all(path.exists() for path in outputs):
+        return None
+    return cached
+
+
+def build_one(md_path: Path, *, repo_root: Path, engine: str, force: bool = False) -> BuiltCable:
     markdown = md_path.read_text(encoding="utf-8")
     source = parse_and_lint_cable_markdown(markdown)
 
+    input_digest = _input_digest(markdown, repo_root=repo_root, engine=engine)
+    if not force:
+        cached = _cached_build(source.cable_id, repo_root=repo_root, input_digest=input_digest)
+        if cached is not None:
+            return cached
+
     canonical_url = canonical_url_for_id(source.cable_id)
 
-    canonical_text = _canonical_text_for_hash(source).encode("ascii")
-    sha256 = compute_sha256_hex_upper(canonical_text)
+    sha256 = compute_sha256_canonical(source)
 
     microcode = microcode_line(cable_id=source.cable_id, utc=source.utc, sha256=sha256, sig=source.sig)
 
@@ -298,10 +412,11 @@ def build_one(md_path: Path, *, repo_root: Path, engine: str) -> BuiltCable:
 
     aztec_png_path = aztec_dir / f"{source.cable_id}.png"
     try:
-        write_aztec_png(aztec_payload, aztec_png_path, module_size=6)
-        aztec_data_uri = render_aztec_png(aztec_payload, module_size=6).as_data_uri()
+        aztec_png = _render_aztec_cached(aztec_payload, module_size=6)
     except AztecError as exc:
         _fail(str(exc))
+    aztec_png_path.write_bytes(aztec_png.png_bytes)
+    aztec_data_uri = aztec_png.as_data_uri()
 
     body_html = render_body_html(source)
     html_template = _load_template(repo_root / "cables" / "templates" / "cable.html")
@@ -350,15 +465,14 @@ def build_one(md_path: Path, *, repo_root: Path, engine: str) -> BuiltCable:
     tex_path = workdir / "cable.tex"
     tex_path.write_text(tex_out, encoding="utf-8")
 
-    _run_latex(engine=engine, workdir=workdir, tex_path=tex_path)
-    _run_latex(engine=engine, workdir=workdir, tex_path=tex_path)
+    _typeset_pdf(engine=engine, workdir=workdir, tex_path=tex_path)
 
     built_pdf_path = workdir / "cable.pdf"
     if not built_pdf_path.exists():
-        _fail("pdflatex did not produce cable.pdf")
+        _fail(f"{engine} did not produce cable.pdf")
 
     pdf_path = pdf_dir / f"{source.cable_id}.pdf"
-    pdf_path.write_bytes(built_pdf_path.read_bytes())
+    shutil.copyfile(built_pdf_path, pdf_path)
 
     built = BuiltCable(
         cable_id=source.cable_id,
@@ -371,10 +485,14 @@ def build_one(md_path: Path, *, repo_root: Path, engine: str) -> BuiltCable:
         html_path=str(html_path.relative_to(repo_root)),
         pdf_path=str(pdf_path.relative_to(repo_root)),
         aztec_payload=aztec_payload,
+        input_digest=input_digest,
+        content_html=_main_fragment(html_out),
     )
 
+    manifest = asdict(built)
+    del manifest["content_html"]
     (manifest_dir / f"{source.cable_id}.json").write_text(
-        json.dumps(asdict(built), indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8"
     )
 
     return built
@@ -441,8 +559,13 @@ def write_feed(repo_root: Path, cables: list[BuiltCable]) -> None:
 
 
 def _feed_content_html(repo_root: Path, cable: BuiltCable) -> str:
+    if cable.content_html:
+        return cable.content_html
     html_path = repo_root / cable.html_path
-    html = html_path.read_text(encoding="utf-8")
+    return _main_fragment(html_path.read_text(encoding="utf-8"))
+
+
+def _main_fragment(html: str) -> str:
     start = html.find("<main>")
     end = html.rfind("</main>")
     if start == -1 or end == -1:
@@ -450,18 +573,20 @@ def _feed_content_html(repo_root: Path, cable: BuiltCable) -> str:
     return html[start:end + len("</main>")]
 
 
+@lru_cache(maxsize=4096)
 def _to_rfc2822(utc_zulu: str) -> str:
     dt = datetime.strptime(utc_zulu, "%Y-%m-%dT%H:%MZ").replace(tzinfo=timezone.utc)
     return dt.strftime("%a, %d %b %Y %H:%M:%S +0000")
 
 
+@lru_cache(maxsize=4096)
 def _to_pdf_date(utc_zulu: str) -> str:
     dt = datetime.strptime(utc_zulu, "%Y-%m-%dT%H:%MZ").replace(tzinfo=timezone.utc)
     return dt.strftime("D:%Y%m%d%H%M00Z")
 
 
 def _xml_escape(text: str) -> str:
-    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+    return text.translate(XML_ESCAPE_TABLE)
 
 
 def iter_markdown_sources(repo_root: Path) -> list[Path]:
@@ -489,18 +614,24 @@ def write_index_and_bundles(repo_root: Path, cables: list[BuiltCable]) -> None:
         day = _day_from_cable_id(cable.cable_id)
         by_day.setdefault(day, []).append(cable)
 
-    for day in by_day:
-        by_day[day].sort(key=lambda c: c.utc, reverse=True)
-
-    all_zip_path = pdf_dir / "cables-all.zip"
-    _write_pdf_bundle(all_zip_path, [repo_root / c.pdf_path for c in cables])
+    for day_cables in by_day.values():
+        day_cables.sort(key=lambda c: c.utc, reverse=True)
 
+    bundles = [(pdf_dir / "cables-all.zip", [repo_root / c.pdf_path for c in cables])]
     for day, day_cables in by_day.items():
-        day_zip_path = daily_pdf_dir / f"{day}.zip"
-        _write_pdf_bundle(day_zip_path, [repo_root / c.pdf_path for c in day_cables])
+        bundles.append((daily_pdf_dir / f"{day}.zip", [repo_root / c.pdf_path for c in day_cables]))
+
+    # Bundles are stored, not deflated, so this only overlaps their file reads and
+    # writes (which release the GIL) across independent bundles.
+    with ThreadPoolExecutor(max_workers=min(8, len(bundles))) as pool:
+        for future in [pool.submit(_write_pdf_bundle, zip_path, paths) for zip_path, paths in bundles]:
+            future.result()
+
+    # The index and the daily pages show the same per-day table.
+    tables_by_day = {day: _render_cables_table(day_cables) for day, day_cables in by_day.items()}
 
     index_template = _load_template(repo_root / "cables" / "templates" / "index.html")
-    day_blocks_html = _render_day_blocks(by_day)
+    day_blocks_html = _render_day_blocks(tables_by_day)
     index_html = _render_template(
         index_template,
         {
@@ -511,8 +642,8 @@ def write_index_and_bundles(repo_root: Path, cables: list[BuiltCable]) -> None:
     )
     (html_dir / "index.html").write_text(index_html, encoding="utf-8")
 
-    for day, day_cables in by_day.items():
-        daily_html = _render_daily_page(day, day_cables)
+    for day, table_html in tables_by_day.items():
+        daily_html = _render_daily_page(day, table_html)
         (html_dir / f"daily-{day}.html").write_text(daily_html, encoding="utf-8")
 
 
@@ -523,55 +654,49 @@ def _day_from_cable_id(cable_id: str) -> str:
     return match.group(1)
 
 
-def _render_day_blocks(by_day: dict[str, list[BuiltCable]]) -> str:
+def _render_day_blocks(tables_by_day: dict[str, str]) -> str:
     blocks: list[str] = []
-    for day in sorted(by_day.keys(), reverse=True):
-        day_cables = by_day[day]
+    for day, table_html in sorted(tables_by_day.items(), reverse=True):
         blocks.append('<section class="day">')
         blocks.append(
             f"<h2>{_html_escape(day)} "
             f"(<a href=\"{_html_escape('daily-' + day + '.html')}\">view</a>, "
             f"<a href=\"{_html_escape('../pdf/daily/' + day + '.zip')}\">PDFs .zip</a>)</h2>"
         )
-        blocks.append(_render_cables_table(day_cables))
+        blocks.append(table_html)
         blocks.append("</section>")
     return "\n".join(blocks)
 
 
 def _render_cables_table(cables: list[BuiltCable]) -> str:
-    rows: list[str] = []
-    for cable in cables:
-        rows.append(
-            "\n".join(
-                [
-                    "<tr>",
-                    f"  <td class=\"mono\"><a href=\"{_html_escape('./' + cable.cable_id + '.html')}\">{_html_escape(cable.cable_id)}</a></td>",
-                    f"  <td class=\"mono\">{_html_escape(cable.utc)}</td>",
-                    f"  <td>{_html_escape(cable.summary)}</td>",
-                    f"  <td class=\"mono\">{_html_escape(cable.sha256[:16])}…</td>",
-                    "  <td>"
-                    f"<a href=\"{_html_escape(cable.canonical_url)}\">Canonical</a>"
-                    f" | <a href=\"{_html_escape('../pdf/' + cable.cable_id + '.pdf')}\">PDF</a>"
-                    "</td>",
-                    "</tr>",
-                ]
-            )
-        )
-
     return (
         "<table>\n"
         "  <thead>\n"
         "    <tr><th>Cable</th><th>UTC</th><th>Summary</th><th>SHA-256</th><th>Links</th></tr>\n"
         "  </thead>\n"
         "  <tbody>\n"
-        + "\n".join(rows)
+        + "\n".join(_render_cable_row(cable) for cable in cables)
         + "\n  </tbody>\n"
         "</table>"
     )
 
 
-def _render_daily_page(day: str, cables: list[BuiltCable]) -> str:
-    table = _render_cables_table(cables)
+def _render_cable_row(cable: BuiltCable) -> str:
+    # The path prefixes/suffixes need no escaping, so the id is escaped once.
+    cid = _html_escape(cable.cable_id)
+    return (
+        "<tr>\n"
+        f"  <td class=\"mono\"><a href=\"./{cid}.html\">{cid}</a></td>\n"
+        f"  <td class=\"mono\">{_html_escape(cable.utc)}</td>\n"
+        f"  <td>{_html_escape(cable.summary)}</td>\n"
+        f"  <td class=\"mono\">{_html_escape(cable.sha256[:16])}…</td>\n"
+        f"  <td><a href=\"{_html_escape(cable.canonical_url)}\">Canonical</a>"
+        f" | <a href=\"../pdf/{cid}.pdf\">PDF</a></td>\n"
+        "</tr>"
+    )
+
+
+def _render_daily_page(day: str, table: str) -> str:
     zip_href = f"../pdf/daily/{day}.zip"
     return "\n".join(
         [
@@ -611,16 +736,42 @@ def _render_daily_page(day: str, cables: list[BuiltCable]) -> str:
     )
 
 
+# PDFs are already Flate/DCT-compressed internally; deflating them again costs
+# CPU for ~1% size.
+BUNDLE_COMPRESSION = zipfile.ZIP_STORED
+
+
+def _bundle_digest(pdf_paths: list[Path]) -> str:
+    h = hashlib.sha256()
+    h.update(f"compression={BUNDLE_COMPRESSION}\0".encode("ascii"))
+    for pdf_path in pdf_paths:
+        h.update(pdf_path.name.encode("utf-8") + b"\0")
+        h.update(hashlib.sha256(pdf_path.read_bytes()).digest())
+    return h.hexdigest()
+
+
 def _write_pdf_bundle(zip_path: Path, pdf_paths: list[Path]) -> None:
     fixed_date_time = (1980, 1, 1, 0, 0, 0)
     zip_path.parent.mkdir(parents=True, exist_ok=True)
 
+    sorted_paths = sorted(pdf_paths, key=lambda p: p.name)
+    # The zip comment records the digest of its inputs; skip identical rewrites.
+    digest = _bundle_digest(sorted_paths).encode("ascii")
+    if zip_path.exists():
+        try:
+            with zipfile.ZipFile(zip_path) as existing:
+                if existing.comment == digest:
+                    return
+        except (OSError, zipfile.BadZipFile):
+            pass
+
     tmp_path = zip_path.with_suffix(zip_path.suffix + ".tmp")
-    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
-        for pdf_path in sorted(pdf_paths, key=lambda p: p.name):
+    with zipfile.ZipFile(tmp_path, "w", compression=BUNDLE_COMPRESSION) as zf:
+        zf.comment = digest
+        for pdf_path in sorted_paths:
             data = pdf_path.read_bytes()
             info = zipfile.ZipInfo(filename=pdf_path.name, date_time=fixed_date_time)
-            info.compress_type = zipfile.ZIP_DEFLATED
+            info.compress_type = BUNDLE_COMPRESSION
             info.create_system = 3
             info.external_attr = (0o644 & 0xFFFF) << 16
             zf.writestr(info, data)
@@ -634,8 +785,15 @@ def main(argv: list[str]) -> int:
     parser.add_argument(
         "--engine",
         default="pdflatex",
-        choices=["lualatex", "pdflatex", "xelatex"],
-        help="LaTeX engine for PDF build (default: pdflatex).",
+        choices=["lualatex", "pdflatex", "tectonic", "xelatex"],
+        help="LaTeX engine for PDF build (default: pdflatex; tectonic falls back to pdflatex if missing).",
+    )
+    parser.add_argument("--force", action="store_true", help="Rebuild even if a cable's inputs are unchanged.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Parallel cable builds for --all (default: CPU count).",
     )
     args = parser.parse_args(argv)
 
@@ -645,14 +803,24 @@ def main(argv: list[str]) -> int:
         if bool(args.in_path) == bool(args.all):
             _fail("exactly one of --in or --all is required")
 
+        engine = _effective_engine(args.engine)
         built: list[BuiltCable] = []
         if args.in_path:
-            built.append(build_one(Path(args.in_path), repo_root=repo_root, engine=args.engine))
+            built.append(build_one(Path(args.in_path), repo_root=repo_root, engine=engine, force=args.force))
         else:
-            for md_path in iter_markdown_sources(repo_root):
-                built.append(build_one(md_path, repo_root=repo_root, engine=args.engine))
-
-        manifests = _load_manifests(repo_root)
+            # Each cable builds in its own tmp/<cable_id> workdir, so builds are independent.
+            sources = iter_markdown_sources(repo_root)
+            build = partial(build_one, repo_root=repo_root, engine=engine, force=args.force)
+            jobs = max(1, min(args.jobs, len(sources)))
+            if jobs == 1:
+                built.extend(build(md_path) for md_path in sources)
+            else:
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    built.extend(pool.map(build, sources))
+
+        # Prefer the just-built cables, which still hold their feed bodies.
+        fresh = {cable.cable_id: cable for cable in built}
+        manifests = [fresh.get(cable.cable_id, cable) for cable in _load_manifests(repo_root)]
         write_feed(repo_root, manifests)
         write_index_and_bundles(repo_root, manifests)
     except (BuildError, LintError) as exc:
@@ -5,6 +5,7 @@ import argparse
 import re
 import sys
 import textwrap
+from functools import lru_cache
 from pathlib import Path
 
 from lint_cable import LintError, REQUIRED_SECTIONS, parse_and_lint_cable_markdown
@@ -22,6 +23,10 @@ RE_MD_IMAGE = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
 RE_MD_CODE = re.compile(r"`([^`]+)`")
 RE_MD_BOLD = re.compile(r"\*\*([^*]+)\*\*")
 RE_MD_ITALIC = re.compile(r"(?<!\*)\*([^*]+)\*(?!\*)")
+# Any of the above, in one alternation.
+RE_MD_INLINE = re.compile(
+    "|".join(f"(?:{rx.pattern})" for rx in (RE_MD_IMAGE, RE_MD_LINK, RE_MD_CODE, RE_MD_BOLD, RE_MD_ITALIC))
+)
 
 
 def _fail(msg: str) -> None:
@@ -34,6 +39,11 @@ def _ensure_no_tabs(text: str) -> None:
 
 
 def _strip_inline_markdown(text: str) -> str:
+    # Most payload lines are plain prose: one combined scan settles them. When
+    # markup is present the ordered passes still run, since nested markup
+    # (e.g. **`x`**) depends on that order and payload bytes are hashed.
+    if not RE_MD_INLINE.search(text):
+        return text
     text = RE_MD_IMAGE.sub(lambda m: f"{m.group(1)} ({m.group(2)})".strip(), text)
     text = RE_MD_LINK.sub(lambda m: f"{m.group(1)} ({m.group(2)})", text)
     text = RE_MD_CODE.sub(lambda m: m.group(1), text)
@@ -50,8 +60,10 @@ def _normalize_spaces(text: str) -> str:
     return text.strip()
 
 
-def _wrap(text: str, *, width: int, initial: str = "", subsequent: str = "") -> list[str]:
-    wrapper = textwrap.TextWrapper(
+@lru_cache(maxsize=None)
+def _wrapper(width: int, initial: str, subsequent: str) -> textwrap.TextWrapper:
+    # Only a couple of (width, indent) combinations exist per run: paragraphs and bullets.
+    return textwrap.TextWrapper(
         width=width,
         expand_tabs=False,
         replace_whitespace=False,
@@ -61,7 +73,10 @@ def _wrap(text: str, *, width: int, initial: str = "", subsequent: str = "") ->
         initial_indent=initial,
         subsequent_indent=subsequent,
     )
-    return wrapper.wrap(text)
+
+
+def _wrap(text: str, *, width: int, initial: str = "", subsequent: str = "") -> list[str]:
+    return _wrapper(width, initial, subsequent).wrap(text)
 
 
 def _canonicalize_paragraph(text: str, *, width: int) -> list[str]:
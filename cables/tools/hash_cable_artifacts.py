@@ -4,8 +4,10 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import mmap
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -14,9 +16,10 @@ class HashError(RuntimeError):
     pass
 
 
-RE_SHA256 = re.compile(r"^[0-9A-F]{64}$")
 RE_UTC_ZULU = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}Z$")
 RE_ID = re.compile(r"^MSPM-CBL-\d{4}-\d{2}-\d{2}-\d{3}$")
+RE_PAYLOAD_HEADER_FIELD = re.compile(r"^(ID|UTC|ISSUER): (.*)$", re.M)
+RE_PAYLOAD_FORBIDDEN = re.compile(rb"[\r\t]|  ")
 
 
 @dataclass(frozen=True)
@@ -30,11 +33,29 @@ def _fail(msg: str) -> None:
     raise HashError(msg)
 
 
-def _sha256_upper(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest().upper()
+def _sha256(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def _hex_upper(digest: bytes) -> str:
+    # bytes.hex() is always lowercase hex; no need to re-validate the result.
+    return digest.hex().upper()
+
+
+def _sha256_file(path: Path) -> bytes:
+    # Stream the file in C-level chunks rather than materializing it as bytes.
+    with path.open("rb", buffering=0) as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").digest()
+        if path.stat().st_size == 0:
+            return _sha256(b"")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(memoryview(mm)).digest()
 
 
 def _require_ascii_bytes(data: bytes, *, context: str) -> None:
+    if data.isascii():
+        return
     for i, b in enumerate(data):
         if b > 0x7F:
             _fail(f"{context}: non-ASCII byte at index {i}: 0x{b:02X}")
@@ -42,6 +63,9 @@ def _require_ascii_bytes(data: bytes, *, context: str) -> None:
 
 def _validate_payload_bytes(payload: bytes) -> None:
     _require_ascii_bytes(payload, context="payload.txt")
+    # One scan for the common (clean) case; the checks below pick the message.
+    if RE_PAYLOAD_FORBIDDEN.search(payload) is None:
+        return
     if b"\r" in payload:
         _fail("payload.txt: CR characters are not allowed (must use \\n)")
     if b"\t" in payload:
@@ -57,15 +81,19 @@ def _parse_payload_header(payload_text: str) -> PayloadHeader:
     if lines[0] != "MSPM CABLE":
         _fail("payload.txt: missing 'MSPM CABLE' header line")
 
-    def get(prefix: str) -> str:
-        for line in lines[1:10]:
-            if line.startswith(prefix):
-                return line[len(prefix) :].strip()
-        _fail(f"payload.txt: missing header field {prefix.strip()}")
+    # First occurrence of each field within the header lines wins.
+    fields: dict[str, str] = {}
+    for key, value in RE_PAYLOAD_HEADER_FIELD.findall("\n".join(lines[1:10])):
+        fields.setdefault(key, value.strip())
+
+    def get(key: str) -> str:
+        if key not in fields:
+            _fail(f"payload.txt: missing header field {key}:")
+        return fields[key]
 
-    cable_id = get("ID: ")
-    utc = get("UTC: ")
-    issuer = get("ISSUER: ")
+    cable_id = get("ID")
+    utc = get("UTC")
+    issuer = get("ISSUER")
 
     if not RE_ID.fullmatch(cable_id):
         _fail("payload.txt: invalid ID field")
@@ -78,10 +106,8 @@ def _parse_payload_header(payload_text: str) -> PayloadHeader:
 
 
 def _require_ascii_str(value: str, *, context: str) -> None:
-    try:
-        value.encode("ascii")
-    except UnicodeEncodeError as exc:
-        raise HashError(f"{context}: must be ASCII") from exc
+    if not value.isascii():
+        raise HashError(f"{context}: must be ASCII")
 
 
 def _write_text_atomic(path: Path, data: bytes) -> None:
@@ -99,27 +125,29 @@ def write_hash_files(*, cable_dir: Path, title: str) -> dict[str, str]:
     if not pdf_path.exists():
         _fail("missing cable.pdf")
 
-    payload_bytes = payload_path.read_bytes()
-    _validate_payload_bytes(payload_bytes)
-    payload_text = payload_bytes.decode("ascii")
+    # hashlib releases the GIL, so the PDF (the large input) hashes on a worker
+    # thread while the payload is validated and hashed here.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pdf_future = pool.submit(_sha256_file, pdf_path)
 
-    header = _parse_payload_header(payload_text)
+        payload_bytes = payload_path.read_bytes()
+        _validate_payload_bytes(payload_bytes)
+        payload_text = payload_bytes.decode("ascii")
 
-    _require_ascii_str(title, context="title")
-    if "\n" in title or "\r" in title or "\t" in title:
-        _fail("title: must be single-line ASCII with no tabs")
-    if "  " in title:
-        _fail("title: must not contain multiple consecutive spaces")
+        header = _parse_payload_header(payload_text)
 
-    payload_sha256 = _sha256_upper(payload_bytes)
-    pdf_sha256 = _sha256_upper(pdf_path.read_bytes())
+        _require_ascii_str(title, context="title")
+        if "\n" in title or "\r" in title or "\t" in title:
+            _fail("title: must be single-line ASCII with no tabs")
+        if "  " in title:
+            _fail("title: must not contain multiple consecutive spaces")
 
-    if not RE_SHA256.fullmatch(payload_sha256):
-        _fail("internal: payload sha256 malformed")
-    if not RE_SHA256.fullmatch(pdf_sha256):
-        _fail("internal: pdf sha256 malformed")
+        payload_digest = _sha256(payload_bytes)
+        pdf_digest = pdf_future.result()
 
-    fp16 = payload_sha256[:16]
+    payload_sha256 = _hex_upper(payload_digest)
+    pdf_sha256 = _hex_upper(pdf_digest)
+    fp16 = _hex_upper(payload_digest[:8])
 
     meta = {
         "id": header.cable_id,
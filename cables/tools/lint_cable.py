@@ -2,7 +2,9 @@
 import argparse
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from md2latex import ensure_ascii as md_ensure_ascii, reject_raw_html as md_reject_raw_html
@@ -14,12 +16,22 @@ RE_CABLE_ID = re.compile(r"^MSPM-CBL-\d{4}-\d{2}-\d{2}-\d{3}$")
 RE_UTC_ZULU = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}Z$")
 RE_SHA256_UPPER = re.compile(r"^[0-9A-F]{64}$")
 RE_SIG = re.compile(r"^[A-Z0-9]+-[A-Z0-9-]+$")
+# The whole well-formed line at once; the field-by-field checks only run to
+# explain a failure.
+RE_MICROCODE = re.compile(
+    r"MSPM-CBL-\d{4}-\d{2}-\d{2}-\d{3} \| UTC:\d{4}-\d{2}-\d{2}T\d{2}:\d{2}Z"
+    r" \| SHA256:[0-9A-F]{64} \| SIG:[A-Z0-9]+-[A-Z0-9-]+",
+    re.ASCII,
+)
 
 RE_FRONTMATTER_KV = re.compile(r"^([a-z_]+):[ \t]*(.+?)[ \t]*$")
 
 RE_SECTION_HEADING = re.compile(r"^##[ \t]+([A-Z]+)[ \t]*$")
 RE_BULLET = re.compile(r"^-[ \t]+(.+)$")
 
+# str.splitlines() boundaries other than "\n" (the markdown is ASCII by then).
+RE_OTHER_LINE_BREAKS = re.compile(r"[\r\x0b\x0c\x1c\x1d\x1e]")
+
 REQUIRED_SECTIONS = ["SUMMARY", "FACTS", "ASSESSMENT", "OUTLOOK"]
 
 
@@ -48,6 +60,9 @@ def ensure_ascii(text: str, *, context: str) -> None:
 
 
 def lint_microcode_line(microcode: str) -> None:
+    if RE_MICROCODE.fullmatch(microcode):
+        return
+
     if "\n" in microcode or "\r" in microcode:
         _fail("microcode: must be a single line (no newlines)")
 
@@ -82,43 +97,18 @@ def lint_microcode_line(microcode: str) -> None:
         _fail("microcode: SIG must match <ALG>-<KEYID> with uppercase ASCII")
 
 
-def _split_frontmatter(lines: list[str]) -> tuple[dict[str, str], list[str]]:
-    if not lines or lines[0].strip() != "---":
-        _fail("frontmatter: missing opening --- line")
-
-    data: dict[str, str] = {}
-    i = 1
-    while i < len(lines):
-        line = lines[i].rstrip("\n")
-        if line.strip() == "---":
-            return data, lines[i + 1 :]
-        if not line.strip():
-            i += 1
-            continue
-        match = RE_FRONTMATTER_KV.fullmatch(line)
-        if not match:
-            _fail(f"frontmatter: invalid line: {line!r}")
-        key, value = match.group(1), match.group(2)
-        data[key] = value
-        i += 1
-
-    _fail("frontmatter: missing closing --- line")
-
-
-def parse_and_lint_cable_markdown(markdown: str) -> CableSource:
-    ensure_ascii(markdown, context="markdown")
-
-    if "```" in markdown:
-        _fail("markdown: fenced code blocks are not allowed")
-
-    try:
-        md_reject_raw_html(markdown, context="markdown")
-    except Exception as exc:
-        _fail(str(exc))
+def _split_lines(text: str) -> list[str]:
+    # Same lines as splitlines(keepends=True) with each "\n" stripped, but
+    # without a copy per line when "\n" is the only line break.
+    if RE_OTHER_LINE_BREAKS.search(text):
+        return [line.rstrip("\n") for line in text.splitlines(keepends=True)]
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
 
-    lines = markdown.splitlines(keepends=True)
-    frontmatter, body_lines = _split_frontmatter(lines)
 
+def _check_frontmatter(frontmatter: dict[str, str]) -> tuple[str, str, str, str]:
     for required_key in ("cable_id", "utc", "title", "sig"):
         if required_key not in frontmatter:
             _fail(f"frontmatter: missing {required_key}")
@@ -136,25 +126,64 @@ def parse_and_lint_cable_markdown(markdown: str) -> CableSource:
     if not RE_SIG.fullmatch(sig):
         _fail("frontmatter.sig: must match <ALG>-<KEYID> with uppercase ASCII")
 
+    return cable_id, utc, title, sig
+
+
+@lru_cache(maxsize=512)
+def parse_and_lint_cable_markdown(markdown: str) -> CableSource:
+    # Cached on the markdown text so build_cable and cable_to_payload share one
+    # parse per cable within a process. The result is shared: treat it as read-only.
+    ensure_ascii(markdown, context="markdown")
+
+    if "```" in markdown:
+        _fail("markdown: fenced code blocks are not allowed")
+
+    try:
+        md_reject_raw_html(markdown, context="markdown")
+    except Exception as exc:
+        _fail(str(exc))
+
+    # One pass over the lines: opening ---, frontmatter, then the body sections.
+    state = "open"
+    frontmatter: dict[str, str] = {}
     sections: dict[str, list[str]] = {}
     current: str | None = None
 
-    for raw_line in body_lines:
-        line = raw_line.rstrip("\n")
-        heading_match = RE_SECTION_HEADING.fullmatch(line)
-        if heading_match:
-            current = heading_match.group(1)
-            if current in sections:
-                _fail(f"markdown: duplicate section heading {current}")
-            sections[current] = []
-            continue
-
-        if current is None:
-            if line.strip():
-                _fail("markdown: content found before first required section heading")
-            continue
+    for line in _split_lines(markdown):
+        if state == "body":
+            heading_match = RE_SECTION_HEADING.fullmatch(line)
+            if heading_match:
+                current = heading_match.group(1)
+                if current in sections:
+                    _fail(f"markdown: duplicate section heading {current}")
+                sections[current] = []
+                continue
+
+            if current is None:
+                if line.strip():
+                    _fail("markdown: content found before first required section heading")
+                continue
+
+            sections[current].append(line)
+        elif state == "frontmatter":
+            stripped = line.strip()
+            if stripped == "---":
+                cable_id, utc, title, sig = _check_frontmatter(frontmatter)
+                state = "body"
+            elif stripped:
+                match = RE_FRONTMATTER_KV.fullmatch(line)
+                if not match:
+                    _fail(f"frontmatter: invalid line: {line!r}")
+                frontmatter[match.group(1)] = match.group(2)
+        else:
+            if line.strip() != "---":
+                _fail("frontmatter: missing opening --- line")
+            state = "frontmatter"
 
-        sections[current].append(line)
+    if state == "open":
+        _fail("frontmatter: missing opening --- line")
+    if state == "frontmatter":
+        _fail("frontmatter: missing closing --- line")
 
     for name in REQUIRED_SECTIONS:
         if name not in sections:
@@ -186,14 +215,33 @@ def _normalize_section_to_text(lines: list[str]) -> str:
     return "\n".join(chunks).strip()
 
 
+def get_parsed_cable(md_path: Path) -> CableSource:
+    return parse_and_lint_cable_markdown(md_path.read_text(encoding="utf-8"))
+
+
+def _lint_one(path: Path) -> str | None:
+    try:
+        get_parsed_cable(path)
+    except LintError as exc:
+        return f"{path}: {exc}"
+    return None
+
+
 def lint_path(path: Path) -> None:
-    if path.is_dir():
-        for file_path in sorted(path.rglob("*.md")):
-            lint_path(file_path)
+    if not path.is_dir():
+        get_parsed_cable(path)
         return
 
-    markdown = path.read_text(encoding="utf-8")
-    parse_and_lint_cable_markdown(markdown)
+    # Files lint independently; report every failure rather than the first one.
+    files = sorted(p for p in path.rglob("*.md") if p.is_file())
+    if len(files) > 8:
+        with ProcessPoolExecutor() as pool:
+            results = list(pool.map(_lint_one, files, chunksize=16))
+    else:
+        results = [_lint_one(file_path) for file_path in files]
+    failures = [result for result in results if result is not None]
+    if failures:
+        _fail("\n".join(failures))
 
 
 def main(argv: list[str]) -> int:
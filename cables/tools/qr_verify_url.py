@@ -20,10 +20,8 @@ def _fail(msg: str) -> None:
 
 
 def _ensure_ascii(text: str, *, context: str) -> None:
-    try:
-        text.encode("ascii")
-    except UnicodeEncodeError as exc:
-        raise QRError(f"{context}: must be ASCII") from exc
+    if not text.isascii():
+        raise QRError(f"{context}: must be ASCII")
 
 
 def _normalize_inputs(cable_id: str, sha256: str) -> tuple[str, str]:
@@ -47,12 +45,20 @@ def build_verification_url(cable_id: str, sha256: str) -> str:
     return url
 
 
-def generate_qr(*, content: str, ec_level: str, out_path: Path, fmt: str) -> None:
+def generate_qr(*, content: str, ec_level: str, out_path: Path, fmts: list[str]) -> None:
+    """Write one image per format from a single QR encode.
+
+    With one format the image goes to out_path; with several, each format gets
+    out_path with its own suffix.
+    """
     _ensure_ascii(content, context="url")
     if ec_level not in {"M", "Q"}:
         _fail("error correction level must be M or Q")
-    if fmt not in {"png", "svg"}:
-        _fail("format must be png or svg")
+    if not fmts:
+        _fail("at least one format is required")
+    for fmt in fmts:
+        if fmt not in {"png", "svg"}:
+            _fail("format must be png or svg")
 
     try:
         import qrcode
@@ -69,23 +75,21 @@ def generate_qr(*, content: str, ec_level: str, out_path: Path, fmt: str) -> Non
         border=4,
     )
     qr.add_data(content)
+    # The Reed-Solomon encode happens here, once for every requested format.
     qr.make(fit=True)
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if fmt == "png":
-        img = qr.make_image(fill_color="black", back_color="white")
-        img.save(out_path)
-        return
-
-    if fmt == "svg":
-        from qrcode.image.svg import SvgImage
+    unique_fmts = list(dict.fromkeys(fmts))
+    for fmt in unique_fmts:
+        target = out_path if len(unique_fmts) == 1 else out_path.with_suffix(f".{fmt}")
+        if fmt == "png":
+            img = qr.make_image(fill_color="black", back_color="white")
+        else:
+            from qrcode.image.svg import SvgImage
 
-        img = qr.make_image(image_factory=SvgImage)
-        img.save(out_path)
-        return
-
-    _fail("unreachable")
+            img = qr.make_image(image_factory=SvgImage)
+        img.save(target)
 
 
 def main(argv: list[str]) -> int:
@@ -93,14 +97,19 @@ def main(argv: list[str]) -> int:
     ap.add_argument("--cable-id", required=True, help="Cable ID (MSPM-CBL-YYYY-MM-DD-XXX)")
     ap.add_argument("--sha256", required=True, help="SHA-256 hex (64 chars; case-insensitive input)")
     ap.add_argument("--ec", choices=["M", "Q"], default="M", help="Error correction level (M or Q).")
-    ap.add_argument("--format", choices=["png", "svg"], default="png", help="Output format.")
+    ap.add_argument(
+        "--format",
+        action="append",
+        choices=["png", "svg"],
+        help="Output format (repeatable; default: png). With several, each gets --out with its own suffix.",
+    )
     ap.add_argument("--out", required=True, help="Output path (.png or .svg).")
     args = ap.parse_args(argv)
 
     try:
         url = build_verification_url(args.cable_id, args.sha256)
         out_path = Path(args.out)
-        generate_qr(content=url, ec_level=args.ec, out_path=out_path, fmt=args.format)
+        generate_qr(content=url, ec_level=args.ec, out_path=out_path, fmts=args.format or ["png"])
     except QRError as exc:
         print(f"ERROR: {exc}", file=sys.stderr)
         return 2
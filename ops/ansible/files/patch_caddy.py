@@ -2,6 +2,11 @@
 from __future__ import annotations
 
 import argparse
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
 from pathlib import Path
 
 
@@ -11,21 +16,28 @@ def find_block(text: str, site: str) -> tuple[int, int]:
     if start == -1:
         raise SystemExit(f"site block not found: {site}")
 
+    # Jump between braces with str.find rather than stepping through every character.
     i = start + len(start_token)
     depth = 1
-    while i < len(text):
-        ch = text[i]
-        if ch == "{":
+    close = -1
+    while True:
+        if close < i:
+            close = text.find("}", i)
+            if close == -1:
+                break
+        open_ = text.find("{", i, close)
+        if open_ != -1:
             depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0:
-                # include trailing newline if present
-                end = i + 1
-                if end < len(text) and text[end] == "\n":
-                    end += 1
-                return start, end
-        i += 1
+            i = open_ + 1
+            continue
+        depth -= 1
+        i = close + 1
+        if depth == 0:
+            # include trailing newline if present
+            end = i
+            if end < len(text) and text[end] == "\n":
+                end += 1
+            return start, end
 
     raise SystemExit(f"unterminated block for site: {site}")
 
@@ -103,6 +115,72 @@ def ensure_ssr_routes(
     return block[:idx] + insert + block[idx:]
 
 
+def _mark_path(caddyfile: Path) -> Path:
+    return caddyfile.with_name(f".{caddyfile.name}.{Path(__file__).stem}.mark")
+
+
+def _mark_digest(text: str, args: argparse.Namespace) -> str:
+    # Keyed on this script's own source and arguments too, so upgrades and new
+    # options re-run the patch.
+    h = hashlib.blake2b(digest_size=16)
+    h.update(Path(__file__).read_bytes())
+    h.update(repr(sorted(vars(args).items())).encode("utf-8"))
+    h.update(text.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _is_converged(mark: Path, digest: str) -> bool:
+    try:
+        return mark.read_text(encoding="ascii").strip() == digest
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def _write_mark(mark: Path, digest: str) -> None:
+    # Best effort: the mark only lets unchanged reruns skip the parse.
+    try:
+        mark.write_text(digest + "\n", encoding="ascii")
+    except OSError:
+        pass
+
+
+def _copy_xattrs(src: Path, dst: str) -> None:
+    # Not shutil.copystat: that would also stamp the old mtime onto the new content.
+    try:
+        names = os.listxattr(src)
+    except OSError as e:
+        if e.errno not in (errno.ENOTSUP, errno.ENODATA, errno.EINVAL):
+            raise
+        return
+    for name in names:
+        try:
+            os.setxattr(dst, name, os.getxattr(src, name))
+        except OSError as e:
+            if e.errno not in (errno.EPERM, errno.ENOTSUP, errno.ENODATA, errno.EINVAL):
+                raise
+
+
+def _atomic_replace(path: Path, text: str) -> None:
+    # Write a sibling temp file and rename it over the Caddyfile, so Caddy never
+    # sees a half-written config. Owner, group, mode and xattrs (SELinux label)
+    # are carried over from the file being replaced.
+    st = path.stat()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.chown(tmp, st.st_uid, st.st_gid)
+        shutil.copymode(path, tmp)
+        _copy_xattrs(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--caddyfile", default="/etc/caddy/Caddyfile")
@@ -113,6 +191,10 @@ def main() -> int:
 
     p = Path(args.caddyfile)
     text = p.read_text(encoding="utf-8")
+    mark = _mark_path(p)
+    if _is_converged(mark, _mark_digest(text, args)):
+        return 0
+
     start, end = find_block(text, args.site)
     block = text[start:end]
 
@@ -120,8 +202,10 @@ def main() -> int:
     new_block = ensure_ssr_routes(new_block, ui_port=args.ui_port, backend_port=args.backend_port)
 
     if new_block != block:
-        p.write_text(text[:start] + new_block + text[end:], encoding="utf-8")
+        text = text[:start] + new_block + text[end:]
+        _atomic_replace(p, text)
 
+    _write_mark(mark, _mark_digest(text, args))
     return 0
 
 
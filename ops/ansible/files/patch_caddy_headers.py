@@ -2,7 +2,13 @@
 from __future__ import annotations
 
 import argparse
+import errno
+import hashlib
+import io
+import os
 import re
+import shutil
+import tempfile
 from pathlib import Path
 
 
@@ -10,23 +16,28 @@ HEADER_OPEN_RE = re.compile(r"^([ \t]*)header\s*\{\s*$")
 HEADER_LINE_RE = re.compile(r"^([ \t]*)([^\s]+)\s+")
 HEADER_CSP_RE = re.compile(r'^([ \t]*)Content-Security-Policy\s+"(.*)"\s*$')
 
+# Browsers require single quotes around CSP keywords like 'self' and 'none'.
+# Keep this minimal and deterministic: only quote known keywords when unquoted.
+CSP_KEYWORDS = (
+    "self",
+    "none",
+    "unsafe-inline",
+    "unsafe-eval",
+    "strict-dynamic",
+    "report-sample",
+    "unsafe-hashes",
+    "wasm-unsafe-eval",
+)
+# Applied one keyword at a time, in order: a single alternation would quote
+# "wasm-unsafe-eval" differently (the "unsafe-eval" pass runs first today).
+CSP_KEYWORD_RES = tuple((kw, re.compile(rf"(?<!')\b{re.escape(kw)}\b(?!')"), f"'{kw}'") for kw in CSP_KEYWORDS)
+
 
 def _quote_csp_keywords(policy: str) -> str:
-    # Browsers require single quotes around CSP keywords like 'self' and 'none'.
-    # Keep this minimal and deterministic: only quote known keywords when unquoted.
-    keywords = (
-        "self",
-        "none",
-        "unsafe-inline",
-        "unsafe-eval",
-        "strict-dynamic",
-        "report-sample",
-        "unsafe-hashes",
-        "wasm-unsafe-eval",
-    )
     out = policy
-    for kw in keywords:
-        out = re.sub(rf"(?<!')\b{re.escape(kw)}\b(?!')", f"'{kw}'", out)
+    for kw, pattern, quoted in CSP_KEYWORD_RES:
+        if kw in out:
+            out = pattern.sub(quoted, out)
     return out
 
 
@@ -39,31 +50,32 @@ def ensure_headers(text: str, policy_value: str, served_by_value: str) -> tuple[
     saw_permissions = False
     saw_served_by = False
 
-    out: list[str] = []
+    out = io.StringIO()
     for line in lines:
+        bare = line.rstrip("\n")
         if not in_header:
-            m = HEADER_OPEN_RE.match(line.rstrip("\n"))
+            m = HEADER_OPEN_RE.match(bare)
             if m:
                 in_header = True
                 header_indent = m.group(1)
                 saw_permissions = False
                 saw_served_by = False
-            out.append(line)
+            out.write(line)
             continue
 
         # Inside a header { } block.
-        m = HEADER_LINE_RE.match(line.rstrip("\n"))
+        m = HEADER_LINE_RE.match(bare)
         if m:
             header_indent_line = m.group(1)
             header_name = m.group(2)
             if header_name == "Content-Security-Policy":
-                m_csp = HEADER_CSP_RE.match(line.rstrip("\n"))
+                m_csp = HEADER_CSP_RE.match(bare)
                 if m_csp:
                     current = m_csp.group(2)
                     fixed = _quote_csp_keywords(current)
                     desired = f'{header_indent_line}Content-Security-Policy "{fixed}"\n'
                     if line != desired:
-                        out.append(desired)
+                        out.write(desired)
                         changed = True
                         continue
             if header_name == "Permissions-Policy":
@@ -78,7 +90,7 @@ def ensure_headers(text: str, policy_value: str, served_by_value: str) -> tuple[
                 saw_served_by = True
                 desired = f'{header_indent_line}X-Served-By "{served_by_value}"\n'
                 if line != desired:
-                    out.append(desired)
+                    out.write(desired)
                     changed = True
                     continue
             if header_name == "X-MSPMetro-Served-By":
@@ -87,21 +99,87 @@ def ensure_headers(text: str, policy_value: str, served_by_value: str) -> tuple[
 
         if line.startswith(f"{header_indent}}}"):
             if not saw_permissions:
-                out.append(f'{header_indent}\tPermissions-Policy "{policy_value}"\n')
+                out.write(f'{header_indent}\tPermissions-Policy "{policy_value}"\n')
                 changed = True
             if not saw_served_by:
-                out.append(f'{header_indent}\tX-Served-By "{served_by_value}"\n')
+                out.write(f'{header_indent}\tX-Served-By "{served_by_value}"\n')
                 changed = True
             in_header = False
             header_indent = ""
             saw_permissions = False
             saw_served_by = False
-            out.append(line)
+            out.write(line)
             continue
 
-        out.append(line)
-
-    return "".join(out), changed
+        out.write(line)
+
+    return out.getvalue(), changed
+
+
+def _mark_path(caddyfile: Path) -> Path:
+    return caddyfile.with_name(f".{caddyfile.name}.{Path(__file__).stem}.mark")
+
+
+def _mark_digest(text: str, args: argparse.Namespace) -> str:
+    # Keyed on this script's own source and arguments too, so upgrades and new
+    # options re-run the patch.
+    h = hashlib.blake2b(digest_size=16)
+    h.update(Path(__file__).read_bytes())
+    h.update(repr(sorted(vars(args).items())).encode("utf-8"))
+    h.update(text.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _is_converged(mark: Path, digest: str) -> bool:
+    try:
+        return mark.read_text(encoding="ascii").strip() == digest
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def _write_mark(mark: Path, digest: str) -> None:
+    # Best effort: the mark only lets unchanged reruns skip the parse.
+    try:
+        mark.write_text(digest + "\n", encoding="ascii")
+    except OSError:
+        pass
+
+
+def _copy_xattrs(src: Path, dst: str) -> None:
+    # Not shutil.copystat: that would also stamp the old mtime onto the new content.
+    try:
+        names = os.listxattr(src)
+    except OSError as e:
+        if e.errno not in (errno.ENOTSUP, errno.ENODATA, errno.EINVAL):
+            raise
+        return
+    for name in names:
+        try:
+            os.setxattr(dst, name, os.getxattr(src, name))
+        except OSError as e:
+            if e.errno not in (errno.EPERM, errno.ENOTSUP, errno.ENODATA, errno.EINVAL):
+                raise
+
+
+def _atomic_replace(path: Path, text: str) -> None:
+    # Write a sibling temp file and rename it over the Caddyfile, so Caddy never
+    # sees a half-written config. Owner, group, mode and xattrs (SELinux label)
+    # are carried over from the file being replaced.
+    st = path.stat()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.chown(tmp, st.st_uid, st.st_gid)
+        shutil.copymode(path, tmp)
+        _copy_xattrs(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
 
 
 def main() -> int:
@@ -121,12 +199,19 @@ def main() -> int:
 
     p = Path(args.caddyfile)
     text = p.read_text(encoding="utf-8")
+    mark = _mark_path(p)
+    if _is_converged(mark, _mark_digest(text, args)):
+        print("OK")
+        return 0
+
     new_text, changed = ensure_headers(text, args.policy, args.served_by)
     if changed:
-        p.write_text(new_text, encoding="utf-8")
+        if new_text != text:
+            _atomic_replace(p, new_text)
         print("CHANGED")
     else:
         print("OK")
+    _write_mark(mark, _mark_digest(new_text, args))
     return 0
 
 
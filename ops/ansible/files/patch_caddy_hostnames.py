@@ -2,6 +2,10 @@
 from __future__ import annotations
 
 import argparse
+import errno
+import os
+import shutil
+import tempfile
 from pathlib import Path
 
 
@@ -16,6 +20,9 @@ def normalize_hostname(h: str) -> str:
 def find_site_line(lines: list[str], primary: str) -> int:
     primary = normalize_hostname(primary)
     for i, line in enumerate(lines):
+        # Cheap substring test first; only candidate lines get stripped and split.
+        if primary not in line:
+            continue
         stripped = line.strip()
         if not stripped.endswith("{"):
             continue
@@ -37,10 +44,13 @@ def ensure_hostnames(line: str, add: list[str]) -> str:
     prefix_ws = line[: len(line) - len(line.lstrip(" \t"))]
     left = stripped[: -len("{")].strip()
     labels = [s.strip() for s in left.split(",") if s.strip()]
+    add_norm = [normalize_hostname(a) for a in add]
+    if all(h in labels for h in add_norm):
+        return line
 
     want = []
     seen = set()
-    for h in labels + [normalize_hostname(a) for a in add]:
+    for h in labels + add_norm:
         if h not in seen:
             seen.add(h)
             want.append(h)
@@ -48,6 +58,43 @@ def ensure_hostnames(line: str, add: list[str]) -> str:
     return f"{prefix_ws}{', '.join(want)} {{\n"
 
 
+def _copy_xattrs(src: Path, dst: str) -> None:
+    # Not shutil.copystat: that would also stamp the old mtime onto the new content.
+    try:
+        names = os.listxattr(src)
+    except OSError as e:
+        if e.errno not in (errno.ENOTSUP, errno.ENODATA, errno.EINVAL):
+            raise
+        return
+    for name in names:
+        try:
+            os.setxattr(dst, name, os.getxattr(src, name))
+        except OSError as e:
+            if e.errno not in (errno.EPERM, errno.ENOTSUP, errno.ENODATA, errno.EINVAL):
+                raise
+
+
+def _atomic_replace(path: Path, text: str) -> None:
+    # Write a sibling temp file and rename it over the Caddyfile, so Caddy never
+    # sees a half-written config. Owner, group, mode and xattrs (SELinux label)
+    # are carried over from the file being replaced.
+    st = path.stat()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.chown(tmp, st.st_uid, st.st_gid)
+        shutil.copymode(path, tmp)
+        _copy_xattrs(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--caddyfile", default="/etc/caddy/Caddyfile")
@@ -65,7 +112,7 @@ def main() -> int:
     new_line = ensure_hostnames(lines[idx], args.add)
     if new_line != lines[idx]:
         lines[idx] = new_line
-        p.write_text("".join(lines), encoding="utf-8")
+        _atomic_replace(p, "".join(lines))
     return 0
 
 
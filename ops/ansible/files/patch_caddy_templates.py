@@ -2,7 +2,12 @@
 from __future__ import annotations
 
 import argparse
+import errno
+import hashlib
+import os
 import re
+import shutil
+import tempfile
 from pathlib import Path
 
 
@@ -22,50 +27,113 @@ def _indent_more(base: str) -> str:
     return base + "    "
 
 
-def _block_has_templates(lines: list[str], start: int, end: int, indent: str) -> bool:
-    needle = f"{indent}templates"
-    for i in range(start, end):
-        if lines[i].startswith(needle):
-            return True
-    return False
-
-
 def ensure_templates(text: str, between_open: str, between_close: str, mime: str) -> tuple[str, bool]:
-    lines = text.splitlines(keepends=True)
+    out: list[str] = []
     changed = False
+    # Index in `out` of the line that opened each enclosing block.
     block_stack: list[int] = []
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-
-        m = TARGET_RE.match(line.rstrip("\n"))
+    # Indent -> index in `out` of the latest "<indent>templates" line, so checking the
+    # current block is O(1) instead of rescanning it.
+    templates_at: dict[str, int] = {}
+    for line in text.splitlines(keepends=True):
+        m = TARGET_RE.match(line)
         if m and block_stack:
             indent = m.group(1)
-            block_start = block_stack[-1]
-            if not _block_has_templates(lines, block_start + 1, i, indent):
+            if templates_at.get(indent, -1) <= block_stack[-1]:
                 indent2 = _indent_more(indent)
-                snippet = [
-                    f"{indent}templates {{\n",
-                    f"{indent2}between {between_open} {between_close}\n",
-                    f"{indent2}mime {mime}\n",
-                    f"{indent}}}\n",
-                ]
-                lines[i:i] = snippet
+                templates_at[indent] = len(out)
+                out.extend(
+                    (
+                        f"{indent}templates {{\n",
+                        f"{indent2}between {between_open} {between_close}\n",
+                        f"{indent2}mime {mime}\n",
+                        f"{indent}}}\n",
+                    )
+                )
                 changed = True
-                i += len(snippet)
-                continue
+
+        if "templates" in line:
+            body = line.lstrip(" \t")
+            if body.startswith("templates"):
+                templates_at[line[: len(line) - len(body)]] = len(out)
 
         opens, closes = _count_braces(line)
         # Track nesting to identify the current enclosing block for targets.
         for _ in range(opens):
-            block_stack.append(i)
+            block_stack.append(len(out))
         for _ in range(closes):
             if block_stack:
                 block_stack.pop()
 
-        i += 1
-
-    return "".join(lines), changed
+        out.append(line)
+
+    return "".join(out), changed
+
+
+def _mark_path(caddyfile: Path) -> Path:
+    return caddyfile.with_name(f".{caddyfile.name}.{Path(__file__).stem}.mark")
+
+
+def _mark_digest(text: str, args: argparse.Namespace) -> str:
+    # Keyed on this script's own source and arguments too, so upgrades and new
+    # options re-run the patch.
+    h = hashlib.blake2b(digest_size=16)
+    h.update(Path(__file__).read_bytes())
+    h.update(repr(sorted(vars(args).items())).encode("utf-8"))
+    h.update(text.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _is_converged(mark: Path, digest: str) -> bool:
+    try:
+        return mark.read_text(encoding="ascii").strip() == digest
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def _write_mark(mark: Path, digest: str) -> None:
+    # Best effort: the mark only lets unchanged reruns skip the parse.
+    try:
+        mark.write_text(digest + "\n", encoding="ascii")
+    except OSError:
+        pass
+
+
+def _copy_xattrs(src: Path, dst: str) -> None:
+    # Not shutil.copystat: that would also stamp the old mtime onto the new content.
+    try:
+        names = os.listxattr(src)
+    except OSError as e:
+        if e.errno not in (errno.ENOTSUP, errno.ENODATA, errno.EINVAL):
+            raise
+        return
+    for name in names:
+        try:
+            os.setxattr(dst, name, os.getxattr(src, name))
+        except OSError as e:
+            if e.errno not in (errno.EPERM, errno.ENOTSUP, errno.ENODATA, errno.EINVAL):
+                raise
+
+
+def _atomic_replace(path: Path, text: str) -> None:
+    # Write a sibling temp file and rename it over the Caddyfile, so Caddy never
+    # sees a half-written config. Owner, group, mode and xattrs (SELinux label)
+    # are carried over from the file being replaced.
+    st = path.stat()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.chown(tmp, st.st_uid, st.st_gid)
+        shutil.copymode(path, tmp)
+        _copy_xattrs(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
 
 
 def main() -> int:
@@ -78,12 +146,19 @@ def main() -> int:
 
     p = Path(args.caddyfile)
     text = p.read_text(encoding="utf-8")
+    mark = _mark_path(p)
+    if _is_converged(mark, _mark_digest(text, args)):
+        print("OK")
+        return 0
+
     new_text, changed = ensure_templates(text, args.between_open, args.between_close, args.mime)
     if changed:
-        p.write_text(new_text, encoding="utf-8")
+        if new_text != text:
+            _atomic_replace(p, new_text)
         print("CHANGED")
     else:
         print("OK")
+    _write_mark(mark, _mark_digest(new_text, args))
     return 0
 
 
@@ -4,17 +4,26 @@ from __future__ import annotations
 import argparse
 import asyncio
 import hashlib
+import http.client
+import io
 import json
 import os
+import pickle
 import random
 import re
+import sqlite3
+import tempfile
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
 import urllib.robotparser
 import xml.etree.ElementTree as ET
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from html.parser import HTMLParser
 from pathlib import Path
 from typing import Any
@@ -48,15 +57,25 @@ def normalize_url(u: str) -> str:
     return u
 
 
+# Quote-aware <link ...> tag; candidate_feed_urls only hands these to the parser.
+# Matched on raw bytes so the page itself is never decoded.
+RE_LINK_TAG = re.compile(rb"""<link\b(?:[^>"']|"[^"]*"|'[^']*')*>""", re.IGNORECASE)
+# Feed <link> tags live in <head>; don't scan further into huge pages than this.
+DEFAULT_HEAD_CAP_BYTES = 1_000_000
+# Likewise for paywall markers in article pages (see looks_paywalled).
+DEFAULT_PAYWALL_SCAN_BYTES = 128 * 1024
+
+
 class FeedLinkParser(HTMLParser):
     def __init__(self) -> None:
         super().__init__()
         self.feed_hrefs: list[str] = []
 
     def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
-        if tag.lower() != "link":
+        # HTMLParser hands over tag and attribute names already lowercased.
+        if tag != "link":
             return
-        d = {k.lower(): (v or "") for k, v in attrs}
+        d = {k: (v or "") for k, v in attrs}
         rel = d.get("rel", "").lower()
         typ = d.get("type", "").lower()
         href = d.get("href", "").strip()
@@ -76,20 +95,21 @@ class ArticleMetaParser(HTMLParser):
         self._ld_json_chunks: list[str] = []
 
     def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
-        t = tag.lower()
-        d = {k.lower(): (v or "") for k, v in attrs}
-        if t == "meta":
+        if tag != "meta" and tag != "script":
+            return
+        d = {k: (v or "") for k, v in attrs}
+        if tag == "meta":
             name = (d.get("name") or d.get("property") or "").strip().lower()
             content = (d.get("content") or "").strip()
             if name and content and name not in self.meta:
                 self.meta[name] = content
-        if t == "script":
+        if tag == "script":
             typ = (d.get("type") or "").strip().lower()
             if typ == "application/ld+json":
                 self._in_ld_json = True
 
     def handle_endtag(self, tag: str) -> None:
-        if tag.lower() == "script" and self._in_ld_json:
+        if tag == "script" and self._in_ld_json:
             self._in_ld_json = False
 
     def handle_data(self, data: str) -> None:
@@ -116,7 +136,27 @@ def _safe_slug(s: str) -> str:
     return s[:80] or "site"
 
 
-@dataclass
+def _write_bytes_atomic(path: Path, data: bytes) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+@dataclass(slots=True, frozen=True)
+class CachedHead:
+    """What the fetch path needs from a cache hit; see DiskCache.get_full for headers."""
+
+    status: int
+    fetched_at: float
+    body_path: Path
+
+
+@dataclass(slots=True, frozen=True)
 class CachedResponse:
     url: str
     status: int
@@ -127,52 +167,123 @@ class CachedResponse:
 
 
 class DiskCache:
+    """Bodies live in a sha256-sharded tree; metadata lives in one SQLite index (cache.db)."""
+
     def __init__(self, root: Path, ttl_seconds: int) -> None:
         self.root = root
         self.ttl_seconds = ttl_seconds
         self.root.mkdir(parents=True, exist_ok=True)
+        # Shared by the event loop and the fetch pool threads; serialize access.
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.root / "cache.db", check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url_hash TEXT PRIMARY KEY, url TEXT NOT NULL, status INTEGER NOT NULL, fetched_at REAL NOT NULL, "
+            "content_type TEXT NOT NULL, headers_json TEXT NOT NULL, size INTEGER NOT NULL)"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
 
-    def _key_dir(self, url: str) -> Path:
-        h = hashlib.sha256(url.encode("utf-8")).hexdigest()
-        return self.root / h[:2] / h[2:4] / h
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _url_hash(url: str) -> str:
+        # Only a filesystem/index key, but keep sha256: it is the on-disk layout of
+        # existing caches and is not a measurable cost next to the index lookup.
+        # Memoized since a fetched URL is keyed again by put() (and robots by get()).
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
 
-    def get(self, url: str) -> CachedResponse | None:
-        d = self._key_dir(url)
+    def _key_dir(self, url_hash: str) -> Path:
+        return self.root / url_hash[:2] / url_hash[2:4] / url_hash
+
+    def _legacy_meta(self, url: str, url_hash: str, d: Path) -> tuple[int, float, str, str] | None:
+        # Caches written before the index existed keep a meta.json next to each body.
+        # Read it once and backfill the index so later lookups skip the file.
         meta_path = d / "meta.json"
-        body_path = d / "body.bin"
-        if not meta_path.exists() or not body_path.exists():
+        if not meta_path.exists():
             return None
         try:
-            meta = json.loads(meta_path.read_text(encoding="utf-8"))
-            fetched_at = float(meta.get("fetched_at") or 0.0)
-            if fetched_at and (time.time() - fetched_at) > self.ttl_seconds:
-                return None
-            return CachedResponse(
-                url=url,
-                status=int(meta.get("status") or 0),
-                fetched_at=fetched_at,
-                content_type=str(meta.get("content_type") or ""),
-                headers=dict(meta.get("headers") or {}),
-                body_path=body_path,
+            meta = json.loads(meta_path.read_bytes())
+            row = (
+                int(meta.get("status") or 0),
+                float(meta.get("fetched_at") or 0.0),
+                str(meta.get("content_type") or ""),
+                json.dumps(dict(meta.get("headers") or {}), sort_keys=True),
             )
         except Exception:
             return None
+        self._index(url_hash, url, *row, size=-1)
+        return row
+
+    def _index(
+        self, url_hash: str, url: str, status: int, fetched_at: float, content_type: str, headers_json: str, *, size: int
+    ) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url_hash, url, status, fetched_at, content_type, headers_json, size),
+            )
+
+    def _lookup(self, url: str) -> tuple[tuple[int, float, str, str], Path] | None:
+        url_hash = self._url_hash(url)
+        d = self._key_dir(url_hash)
+        body_path = d / "body.bin"
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, fetched_at, content_type, headers_json FROM responses WHERE url_hash = ?", (url_hash,)
+            ).fetchone()
+        if row is None:
+            row = self._legacy_meta(url, url_hash, d)
+            if row is None:
+                return None
+        fetched_at = row[1]
+        if fetched_at and (time.time() - fetched_at) > self.ttl_seconds:
+            return None
+        if not body_path.exists():
+            return None
+        return row, body_path
+
+    def get(self, url: str) -> CachedHead | None:
+        hit = self._lookup(url)
+        if hit is None:
+            return None
+        (status, fetched_at, _, _), body_path = hit
+        return CachedHead(status=int(status), fetched_at=float(fetched_at), body_path=body_path)
+
+    def get_full(self, url: str) -> CachedResponse | None:
+        hit = self._lookup(url)
+        if hit is None:
+            return None
+        (status, fetched_at, content_type, headers_json), body_path = hit
+        try:
+            headers = dict(json.loads(headers_json))
+        except Exception:
+            return None
+        return CachedResponse(
+            url=url,
+            status=int(status),
+            fetched_at=float(fetched_at),
+            content_type=content_type,
+            headers=headers,
+            body_path=body_path,
+        )
 
     def put(self, url: str, *, status: int, headers: dict[str, str], content_type: str, body: bytes) -> CachedResponse:
-        d = self._key_dir(url)
+        url_hash = self._url_hash(url)
+        d = self._key_dir(url_hash)
         d.mkdir(parents=True, exist_ok=True)
         body_path = d / "body.bin"
-        meta_path = d / "meta.json"
-        body_path.write_bytes(body)
-        meta = {
-            "url": url,
-            "status": int(status),
-            "fetched_at": time.time(),
-            "content_type": content_type,
-            "headers": headers,
-        }
-        meta_path.write_text(json.dumps(meta, indent=2, sort_keys=True), encoding="utf-8")
-        return CachedResponse(url=url, status=status, fetched_at=meta["fetched_at"], content_type=content_type, headers=headers, body_path=body_path)
+        # Publish the body atomically (and before its index row) so a crash mid-write
+        # never leaves a truncated body behind a valid entry.
+        _write_bytes_atomic(body_path, body)
+        fetched_at = time.time()
+        self._index(
+            url_hash, url, int(status), fetched_at, content_type, json.dumps(headers, sort_keys=True), size=len(body)
+        )
+        return CachedResponse(url=url, status=status, fetched_at=fetched_at, content_type=content_type, headers=headers, body_path=body_path)
 
 
 class DomainLimiter:
@@ -196,12 +307,48 @@ class RobotsCache:
         self.cache = cache
         self.ua = ua
         self._mem: dict[str, urllib.robotparser.RobotFileParser] = {}
+        # One robots.txt fetch per origin even when several fetches start at once.
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def _persist_path(self, base: str) -> Path:
+        h = hashlib.sha256(base.encode("utf-8")).hexdigest()
+        return self.cache.root / "robots" / h[:2] / f"{h}.pkl"
+
+    def _load(self, base: str) -> urllib.robotparser.RobotFileParser | None:
+        path = self._persist_path(base)
+        try:
+            if (time.time() - path.stat().st_mtime) > self.cache.ttl_seconds:
+                return None
+            rp = pickle.loads(path.read_bytes())
+        except Exception:
+            return None
+        return rp if isinstance(rp, urllib.robotparser.RobotFileParser) else None
+
+    def _store(self, base: str, rp: urllib.robotparser.RobotFileParser) -> None:
+        self._mem[base] = rp
+        path = self._persist_path(base)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write_bytes_atomic(path, pickle.dumps(rp))
+        except OSError:
+            pass
 
     async def allowed(self, url: str, fetch: "Fetcher") -> bool:
         parsed = urllib.parse.urlparse(url)
         base = f"{parsed.scheme}://{parsed.netloc}"
-        if base in self._mem:
-            rp = self._mem[base]
+        rp = self._mem.get(base)
+        if rp is not None:
+            return rp.can_fetch(self.ua, url)
+        async with self._locks.setdefault(base, asyncio.Lock()):
+            return await self._allowed_locked(base, url, fetch)
+
+    async def _allowed_locked(self, base: str, url: str, fetch: "Fetcher") -> bool:
+        rp = self._mem.get(base)
+        if rp is None:
+            rp = self._load(base)
+            if rp is not None:
+                self._mem[base] = rp
+        if rp is not None:
             return rp.can_fetch(self.ua, url)
 
         robots_url = urllib.parse.urljoin(base + "/", "robots.txt")
@@ -212,13 +359,122 @@ class RobotsCache:
             rp.parse(raw.decode("utf-8", errors="replace").splitlines())
         except Exception:
             # If robots is unparsable, default to allow.
-            self._mem[base] = rp
+            self._store(base, rp)
             return True
 
-        self._mem[base] = rp
+        self._store(base, rp)
         return rp.can_fetch(self.ua, url)
 
 
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+# Cached responses with these statuses are replayed as errors for a while
+# instead of being refetched (unless --refetch-errors).
+NEGATIVE_CACHE_STATUSES = frozenset({301, 302, 403, 404, 410})
+NEGATIVE_CACHE_TTL_SECONDS = 3600
+MAX_REDIRECTS = 10
+
+
+class KeepAlivePool:
+    """Idle HTTP(S) connections per origin, so repeat fetches from one host reuse TCP/TLS.
+
+    Bodies are requested gzip-compressed and decoded here, capped at `max_bytes`
+    of decoded output. Redirects and error statuses mirror urlopen: non-2xx
+    responses raise urllib.error.HTTPError.
+    """
+
+    def __init__(self, *, timeout: float) -> None:
+        self.timeout = timeout
+        self._idle: dict[tuple[str, str, int | None], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            conns = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for c in conns:
+            c.close()
+
+    def _checkout(self, key: tuple[str, str, int | None]) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=self.timeout), False
+
+    def _checkin(self, key: tuple[str, str, int | None], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.setdefault(key, []).append(conn)
+
+    def _get_once(
+        self, url: str, headers: dict[str, str], *, max_bytes: int
+    ) -> tuple[int, str, http.client.HTTPMessage, bytes]:
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname or "", parts.port)
+        selector = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        while True:
+            conn, reused = self._checkout(key)
+            sent = False
+            try:
+                conn.request("GET", selector, headers=headers)
+                sent = True
+                resp = conn.getresponse()
+            except BaseException as err:
+                conn.close()
+                if reused and isinstance(err, (ConnectionResetError, BrokenPipeError)):
+                    # The server dropped an idle keep-alive connection; retry on another.
+                    continue
+                if not sent and isinstance(err, OSError):
+                    # Same wrapping as urlopen, so error messages are unchanged.
+                    raise urllib.error.URLError(err)
+                raise
+            break
+
+        complete = False
+        try:
+            msg = resp.msg
+            limit = max_bytes + 1
+            if (resp.getheader("content-encoding") or "").strip().lower() == "gzip":
+                d = zlib.decompressobj(zlib.MAX_WBITS | 16)
+                chunks: list[bytes] = []
+                size = 0
+                while size < limit and not d.eof:
+                    data = d.unconsumed_tail or resp.read(64 * 1024)
+                    if not data:
+                        break
+                    out = d.decompress(data, limit - size)
+                    chunks.append(out)
+                    size += len(out)
+                body = b"".join(chunks)
+                complete = d.eof and not d.unconsumed_tail and not resp.read(1)
+                del msg["content-encoding"]
+                del msg["content-length"]
+            else:
+                body = resp.read(limit)
+                complete = resp.isclosed()
+        finally:
+            if complete and not resp.will_close:
+                self._checkin(key, conn)
+            else:
+                conn.close()
+        return resp.status, resp.reason, msg, body[:max_bytes]
+
+    def get(self, url: str, headers: dict[str, str], *, max_bytes: int) -> tuple[int, http.client.HTTPMessage, bytes]:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, reason, msg, body = self._get_once(url, headers, max_bytes=max_bytes)
+            location = msg.get("location") or msg.get("uri")
+            if status not in REDIRECT_STATUSES or not location:
+                break
+            target = urllib.parse.urljoin(url, location)
+            if urllib.parse.urlsplit(target).scheme not in ("http", "https"):
+                break
+            url = target
+        if not 200 <= status < 300:
+            raise urllib.error.HTTPError(url, status, reason, msg, io.BytesIO(body))
+        return status, msg, body
+
+
 class Fetcher:
     def __init__(
         self,
@@ -230,6 +486,7 @@ class Fetcher:
         max_bytes: int,
         concurrency: int,
         respect_robots: bool,
+        refetch_errors: bool = False,
     ) -> None:
         self.cache = cache
         self.ua = ua
@@ -237,9 +494,19 @@ class Fetcher:
         self.max_delay = max_delay
         self.max_bytes = max_bytes
         self.respect_robots = respect_robots
-        self._sem = asyncio.Semaphore(concurrency)
+        self.refetch_errors = refetch_errors
+        # urllib is blocking: run it on a pool sized to the concurrency cap, which
+        # bounds in-flight requests without a separate semaphore.
+        self._pool = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="fetch")
         self._limiters: dict[str, DomainLimiter] = {}
         self.robots = RobotsCache(cache, ua=ua)
+        # Plain urlopen still handles proxied environments and non-http(s) URLs.
+        self._http = None if urllib.request.getproxies() else KeepAlivePool(timeout=25)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        if self._http is not None:
+            self._http.close()
 
     def _limiter(self, url: str) -> DomainLimiter:
         host = urllib.parse.urlparse(url).netloc.lower()
@@ -255,6 +522,14 @@ class Fetcher:
         cached = self.cache.get(url)
         if cached and cached.status == 200:
             return cached.body_path.read_bytes()
+        if (
+            cached
+            and not self.refetch_errors
+            and cached.status in NEGATIVE_CACHE_STATUSES
+            and (time.time() - cached.fetched_at) < NEGATIVE_CACHE_TTL_SECONDS
+        ):
+            reason = http.client.responses.get(cached.status, "")
+            raise urllib.error.HTTPError(url, cached.status, reason, None, None)
 
         if (not _skip_robots) and self.respect_robots and not await self.robots.allowed(url, self):
             raise PermissionError(f"disallowed by robots.txt: {url}")
@@ -262,33 +537,31 @@ class Fetcher:
         limiter = self._limiter(url)
         await limiter.wait_turn()
 
-        async with self._sem:
-            return await asyncio.to_thread(self._blocking_get, url, accept)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self._blocking_get, url, accept)
 
     def _blocking_get(self, url: str, accept: str) -> bytes:
-        cached = self.cache.get(url)
-        if cached and cached.status == 200:
-            return cached.body_path.read_bytes()
-
-        req = urllib.request.Request(
-            url,
-            headers={
-                "User-Agent": self.ua,
-                "Accept": accept,
-                "Accept-Language": "en-US,en;q=0.8",
-                "DNT": "1",
-            },
-        )
+        # get_bytes has already consulted the cache; this only does the network fetch.
+        req_headers = {
+            "User-Agent": self.ua,
+            "Accept": accept,
+            "Accept-Language": "en-US,en;q=0.8",
+            "DNT": "1",
+        }
         try:
-            with urllib.request.urlopen(req, timeout=25) as resp:
-                status = int(getattr(resp, "status", 200) or 200)
-                headers = {k.lower(): v for k, v in resp.headers.items()}
-                content_type = headers.get("content-type", "")
-                body = resp.read(self.max_bytes + 1)
-                if len(body) > self.max_bytes:
-                    body = body[: self.max_bytes]
-                self.cache.put(url, status=status, headers=headers, content_type=content_type, body=body)
-                return body
+            if self._http is not None and urllib.parse.urlsplit(url).scheme in ("http", "https"):
+                status, msg, body = self._http.get(url, {**req_headers, "Accept-Encoding": "gzip"}, max_bytes=self.max_bytes)
+                headers = {k.lower(): v for k, v in msg.items()}
+            else:
+                with urllib.request.urlopen(urllib.request.Request(url, headers=req_headers), timeout=25) as resp:
+                    status = int(getattr(resp, "status", 200) or 200)
+                    headers = {k.lower(): v for k, v in resp.headers.items()}
+                    body = resp.read(self.max_bytes + 1)
+                    if len(body) > self.max_bytes:
+                        body = body[: self.max_bytes]
+            content_type = headers.get("content-type", "")
+            self.cache.put(url, status=status, headers=headers, content_type=content_type, body=body)
+            return body
         except urllib.error.HTTPError as e:
             status = int(getattr(e, "code", 0) or 0)
             body = e.read(self.max_bytes + 1) if hasattr(e, "read") else b""
@@ -298,11 +571,34 @@ class Fetcher:
             raise
 
 
-def candidate_feed_urls(base: str, html_bytes: bytes) -> list[str]:
-    html = html_bytes.decode("utf-8", errors="replace")
+COMMON_FEED_PATHS = (
+    "/feed",
+    "/rss",
+    "/rss.xml",
+    "/atom.xml",
+    "/index.xml",
+    "/feed.xml",
+    "/feeds/posts/default?alt=rss",
+)
+
+
+@lru_cache(maxsize=1024)
+def _common_feed_urls(base: str) -> tuple[str, ...]:
+    parsed = urllib.parse.urlparse(base)
+    origin = f"{parsed.scheme}://{parsed.netloc}"
+    if parsed.scheme and parsed.netloc:
+        # Absolute paths against a bare origin: urljoin would only concatenate.
+        return tuple(origin + path for path in COMMON_FEED_PATHS)
+    return tuple(urllib.parse.urljoin(origin, path) for path in COMMON_FEED_PATHS)
+
+
+def candidate_feed_urls(base: str, html_bytes: bytes, *, head_cap_bytes: int = DEFAULT_HEAD_CAP_BYTES) -> list[str]:
+    if head_cap_bytes > 0:
+        html_bytes = html_bytes[:head_cap_bytes]
     p = FeedLinkParser()
     try:
-        p.feed(html)
+        # Tokenize (and decode) just the <link> tags rather than the whole page.
+        p.feed(b"".join(RE_LINK_TAG.findall(html_bytes)).decode("utf-8", errors="replace"))
     except Exception:
         pass
 
@@ -321,27 +617,49 @@ def candidate_feed_urls(base: str, html_bytes: bytes) -> list[str]:
     for href in p.feed_hrefs:
         add(urllib.parse.urljoin(base, href))
 
-    parsed = urllib.parse.urlparse(base)
-    origin = f"{parsed.scheme}://{parsed.netloc}"
-    common_paths = [
-        "/feed",
-        "/rss",
-        "/rss.xml",
-        "/atom.xml",
-        "/index.xml",
-        "/feed.xml",
-        "/feeds/posts/default?alt=rss",
-    ]
-    for path in common_paths:
-        add(urllib.parse.urljoin(origin, path))
+    for u in _common_feed_urls(base):
+        add(u)
 
     return out
 
 
+FEED_PARSE_CHUNK = 64 * 1024
+
+
+def _parse_feed_root(txt: str, *, limit: int) -> ET.Element:
+    """Parse incrementally and stop once `limit` RSS items / Atom entries have closed.
+
+    The returned root holds everything parsed so far, so the rest of a large feed
+    is never built into a tree (or checked for well-formedness).
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root: ET.Element | None = None
+    depth = 0
+    closed_items = 0
+    for offset in range(0, len(txt), FEED_PARSE_CHUNK):
+        parser.feed(txt[offset : offset + FEED_PARSE_CHUNK])
+        for event, el in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = el
+                depth += 1
+                continue
+            depth -= 1
+            # rss > channel > item closes at depth 2; feed > entry at depth 1.
+            if (depth == 2 and el.tag == "item") or (depth == 1 and el.tag.rsplit("}", 1)[-1] == "entry"):
+                closed_items += 1
+        if limit > 0 and closed_items >= limit and root is not None:
+            return root
+    parser.close()
+    if root is None:
+        raise ET.ParseError("no element found")
+    return root
+
+
 def parse_feed(feed_url: str, raw: bytes, *, limit: int) -> dict[str, Any]:
     txt = raw.decode("utf-8", errors="replace")
     try:
-        root = ET.fromstring(txt)
+        root = _parse_feed_root(txt, limit=limit)
     except Exception:
         return {"ok": False, "error": "invalid XML", "items": []}
 
@@ -410,7 +728,32 @@ def parse_feed(feed_url: str, raw: bytes, *, limit: int) -> dict[str, Any]:
     return {"ok": False, "error": "unrecognized feed format", "items": []}
 
 
+_JSON_DECODER = json.JSONDecoder()
+RE_JSON_WS = re.compile(r"[ \t\n\r]*")
+# Cheap byte-level screens so most pages skip decoding and full tokenization:
+# any author-ish name/property attribute, quote-aware <meta ...> tags, and ld+json.
+RE_META_AUTHOR_HINT = re.compile(rb"""\b(?:name|property)\s*=\s*["']?\s*(?:parsely-|article:)?author\b""", re.IGNORECASE)
+RE_META_TAG = re.compile(rb"""<meta\b(?:[^>"']|"[^"]*"|'[^']*')*>""", re.IGNORECASE)
+RE_LD_JSON_HINT = re.compile(rb"ld\+json", re.IGNORECASE)
+
+
 def extract_author_from_html(html_bytes: bytes) -> str:
+    if RE_META_AUTHOR_HINT.search(html_bytes):
+        p = ArticleMetaParser()
+        try:
+            p.feed(b"".join(RE_META_TAG.findall(html_bytes)).decode("utf-8", errors="replace"))
+        except Exception:
+            pass
+        meta = p.meta
+        author = _first(meta.get("author", ""), meta.get("parsely-author", ""), meta.get("article:author", ""))
+        if author:
+            return author
+
+    if not RE_LD_JSON_HINT.search(html_bytes):
+        return ""
+
+    # Only ld+json can still supply an author; that needs the full tokenizer to
+    # find the script bodies.
     html = html_bytes.decode("utf-8", errors="replace")
     p = ArticleMetaParser()
     try:
@@ -418,25 +761,20 @@ def extract_author_from_html(html_bytes: bytes) -> str:
     except Exception:
         pass
 
-    meta = p.meta
-    author = _first(meta.get("author", ""), meta.get("parsely-author", ""), meta.get("article:author", ""))
-    if author:
-        return author
-
-    ld = "\n".join(p._ld_json_chunks).strip()
-    if not ld:
-        return ""
-
-    # ld+json can contain multiple JSON objects; parse cautiously.
+    # Each ld+json block can hold several concatenated JSON values; decode them one
+    # after another and give up on the rest of a block at the first malformed value.
     candidates: list[Any] = []
-    for chunk in re.split(r"\n\\s*\n", ld):
-        chunk = chunk.strip()
-        if not chunk:
-            continue
-        try:
-            candidates.append(json.loads(chunk))
-        except Exception:
-            continue
+    for chunk in p._ld_json_chunks:
+        i = 0
+        while True:
+            i = RE_JSON_WS.match(chunk, i).end()
+            if i >= len(chunk):
+                break
+            try:
+                obj, i = _JSON_DECODER.raw_decode(chunk, i)
+            except ValueError:
+                break
+            candidates.append(obj)
 
     def pull_author(obj: Any) -> str:
         if isinstance(obj, dict):
@@ -466,6 +804,39 @@ def extract_author_from_html(html_bytes: bytes) -> str:
     return ""
 
 
+FEED_ACCEPT = "application/rss+xml,application/atom+xml,application/xml,text/xml,*/*"
+MAX_FEEDS_PER_SITE = 6
+
+# URL -> in-flight or finished (paywalled, author) sample; shared by all site tasks.
+ArticleMemo = dict[str, "asyncio.Future[tuple[bool, str] | None]"]
+
+
+async def _fetch_article_sample(url: str, fetcher: Fetcher, paywall_scan_bytes: int) -> tuple[bool, str] | None:
+    try:
+        art = await fetcher.get_bytes(url, accept="text/html,application/xhtml+xml,*/*")
+    except Exception:
+        return None
+    return (True, "") if looks_paywalled(art, scan_bytes=paywall_scan_bytes) else (False, extract_author_from_html(art))
+
+
+async def sample_article(
+    url: str, *, fetcher: Fetcher, memo: ArticleMemo, paywall_scan_bytes: int = DEFAULT_PAYWALL_SCAN_BYTES
+) -> tuple[bool, str] | None:
+    """Fetch one article and return (paywalled, author), or None if the fetch failed.
+
+    Samples are memoized per URL for the run (including while in flight), since
+    sites often list the same articles in several feeds. Failures are dropped
+    from the memo so a later encounter retries them.
+    """
+    fut = memo.get(url)
+    if fut is None:
+        fut = memo[url] = asyncio.ensure_future(_fetch_article_sample(url, fetcher, paywall_scan_bytes))
+    result = await fut
+    if result is None and memo.get(url) is fut:
+        del memo[url]
+    return result
+
+
 async def discover_for_site(
     site_url: str,
     *,
@@ -473,12 +844,17 @@ async def discover_for_site(
     sample_items: int,
     fetch_articles: bool,
     max_articles_per_feed: int,
+    article_memo: ArticleMemo | None = None,
+    head_cap_bytes: int = DEFAULT_HEAD_CAP_BYTES,
+    paywall_scan_bytes: int = DEFAULT_PAYWALL_SCAN_BYTES,
 ) -> dict[str, Any]:
     site_url = normalize_url(site_url)
     if not site_url:
         return {}
 
     rec: dict[str, Any] = {"site_url": site_url, "feeds": [], "errors": []}
+    if article_memo is None:
+        article_memo = {}
 
     try:
         html = await fetcher.get_bytes(site_url, accept="text/html,application/xhtml+xml")
@@ -486,47 +862,35 @@ async def discover_for_site(
         rec["errors"].append(f"fetch site failed: {e}")
         return rec
 
-    feeds = candidate_feed_urls(site_url, html)
+    # Candidates are fetched concurrently in windows no larger than the number of
+    # feeds still wanted, so exactly the same URLs are fetched as a one-by-one
+    # scan would, and results are still handled in candidate order.
+    pending = candidate_feed_urls(site_url, html, head_cap_bytes=head_cap_bytes)
     checked = 0
-    for fu in feeds:
-        if checked >= 6:
-            break
-        try:
-            raw = await fetcher.get_bytes(fu, accept="application/rss+xml,application/atom+xml,application/xml,text/xml,*/*")
-        except Exception:
-            continue
-        parsed = parse_feed(fu, raw, limit=sample_items)
-        if not parsed.get("ok"):
-            continue
-
-        feed_rec: dict[str, Any] = {"feed_url": fu, **parsed}
-
-        if fetch_articles:
-            fetched = 0
-            paywalled = 0
-            for item in feed_rec.get("items") or []:
-                if fetched >= max_articles_per_feed:
-                    break
-                url = (item.get("url") or "").strip()
-                if not url:
-                    continue
-                try:
-                    art = await fetcher.get_bytes(url, accept="text/html,application/xhtml+xml,*/*")
-                except Exception:
-                    continue
-                if looks_paywalled(art):
-                    item["paywalled"] = True
-                    paywalled += 1
-                    continue
-                discovered_author = extract_author_from_html(art)
-                if discovered_author and not item.get("author"):
-                    item["author"] = discovered_author
-                fetched += 1
-            feed_rec["paywalled_sampled"] = paywalled
-            feed_rec["fetched_sampled"] = fetched
+    while pending and checked < MAX_FEEDS_PER_SITE:
+        window, pending = pending[: MAX_FEEDS_PER_SITE - checked], pending[MAX_FEEDS_PER_SITE - checked :]
+        raws = await asyncio.gather(*(fetcher.get_bytes(fu, accept=FEED_ACCEPT) for fu in window), return_exceptions=True)
+        for fu, raw in zip(window, raws):
+            if isinstance(raw, Exception):
+                continue
+            if isinstance(raw, BaseException):
+                raise raw
+            parsed = parse_feed(fu, raw, limit=sample_items)
+            if not parsed.get("ok"):
+                continue
+
+            feed_rec: dict[str, Any] = {"feed_url": fu, **parsed}
+            if fetch_articles:
+                await _sample_feed_articles(
+                    feed_rec,
+                    fetcher=fetcher,
+                    max_articles=max_articles_per_feed,
+                    memo=article_memo,
+                    paywall_scan_bytes=paywall_scan_bytes,
+                )
 
-        rec["feeds"].append(feed_rec)
-        checked += 1
+            rec["feeds"].append(feed_rec)
+            checked += 1
 
     if not rec["feeds"]:
         rec["errors"].append("no valid RSS/Atom feeds found (may require manual endpoints or HTML scraping)")
@@ -534,6 +898,32 @@ async def discover_for_site(
     return rec
 
 
+async def _sample_feed_articles(
+    feed_rec: dict[str, Any], *, fetcher: Fetcher, max_articles: int, memo: ArticleMemo, paywall_scan_bytes: int
+) -> None:
+    # Same windowing as the feed candidates: only paywall-free fetches count
+    # towards max_articles, so never start more samples than are still needed.
+    todo = [(item, url) for item in feed_rec.get("items") or [] if (url := (item.get("url") or "").strip())]
+    fetched = 0
+    paywalled = 0
+    while todo and fetched < max_articles:
+        window, todo = todo[: max_articles - fetched], todo[max_articles - fetched :]
+        samples = await asyncio.gather(*(sample_article(url, fetcher=fetcher, memo=memo, paywall_scan_bytes=paywall_scan_bytes) for _, url in window))
+        for (item, _), sampled in zip(window, samples):
+            if sampled is None:
+                continue
+            is_paywalled, discovered_author = sampled
+            if is_paywalled:
+                item["paywalled"] = True
+                paywalled += 1
+                continue
+            if discovered_author and not item.get("author"):
+                item["author"] = discovered_author
+            fetched += 1
+    feed_rec["paywalled_sampled"] = paywalled
+    feed_rec["fetched_sampled"] = fetched
+
+
 def read_seeds(path: str) -> list[str]:
     out: list[str] = []
     for line in open(path, "r", encoding="utf-8"):
@@ -557,49 +947,91 @@ def read_denylist(path: str) -> list[str]:
     return out
 
 
-def is_denied(url: str, denied: list[str]) -> bool:
-    u = (url or "").lower()
-    for d in denied:
-        if d and d in u:
-            return True
-    return False
-
-
-def looks_paywalled(html_bytes: bytes) -> bool:
-    html = html_bytes.decode("utf-8", errors="replace").lower()
-    # Heuristics for common paywall/metered frameworks + UI copy.
-    patterns = [
-        r"\bpaywall\b",
-        r"\bmetered\b",
-        r"\bavailable to subscribers\b",
-        r"\bfor subscribers\b",
-        r"\bsubscription required\b",
-        r"\bsign in to continue\b",
-        r"\bsign in\b.*\bto continue reading\b",
-        r"\bcontinue reading\b.*\bsubscribe\b",
-        r"\bsubscribe\b.*\bto continue reading\b",
-        r"\bthis content is only available\b.*\bsubscribers?\b",
-        r"\bregister\b.*\bto continue reading\b",
-        r"tinypass|piano\.io|cxense|zephr|leaky-paywall|laterpay|subscriptions?\.",
-        r"data-paywall|class=[\"'][^\"']*paywall|id=[\"'][^\"']*paywall",
-        r"meteredcontent|arc-paywall|cpt-shim|tp-modal",
-        r"amp-access|subscribe\.js|paywall\.js",
-    ]
-    for pat in patterns:
-        try:
-            if re.search(pat, html):
-                return True
-        except re.error:
-            continue
-    return False
+def compile_denylist(denied: list[str]) -> re.Pattern[str] | None:
+    """One alternation over all entries, so a URL is scanned once instead of once per entry."""
+    entries = sorted({d for d in denied if d})
+    if not entries:
+        return None
+    return re.compile("|".join(map(re.escape, entries)))
+
+
+def matches_denylist(url: str, deny_re: re.Pattern[str] | None) -> bool:
+    return deny_re is not None and deny_re.search((url or "").lower()) is not None
+
+
+# Heuristics for common paywall/metered frameworks + UI copy.
+PAYWALL_PATTERNS = (
+    r"\bpaywall\b",
+    r"\bmetered\b",
+    r"\bavailable to subscribers\b",
+    r"\bfor subscribers\b",
+    r"\bsubscription required\b",
+    r"\bsign in to continue\b",
+    r"\bsign in\b.*\bto continue reading\b",
+    r"\bcontinue reading\b.*\bsubscribe\b",
+    r"\bsubscribe\b.*\bto continue reading\b",
+    r"\bthis content is only available\b.*\bsubscribers?\b",
+    r"\bregister\b.*\bto continue reading\b",
+    r"tinypass|piano\.io|cxense|zephr|leaky-paywall|laterpay|subscriptions?\.",
+    r"data-paywall|class=[\"'][^\"']*paywall|id=[\"'][^\"']*paywall",
+    r"meteredcontent|arc-paywall|cpt-shim|tp-modal",
+    r"amp-access|subscribe\.js|paywall\.js",
+)
+# Every signature is ASCII, so matching runs on ASCII-lowercased bytes and the
+# page is never decoded. (\b is ASCII-only on bytes, which only differs next to
+# non-ASCII letters.)
+PAYWALL_RE = re.compile("|".join(f"(?:{pat})" for pat in PAYWALL_PATTERNS).encode("ascii"))
+# Each pattern above contains at least one of these literals; pages with none of
+# them skip the regex entirely.
+PAYWALL_LITERALS = (
+    b"paywall",
+    b"metered",
+    b"subscri",
+    b"sign in",
+    b"register",
+    b"tinypass",
+    b"piano.io",
+    b"cxense",
+    b"zephr",
+    b"laterpay",
+    b"cpt-shim",
+    b"tp-modal",
+    b"amp-access",
+)
+
+
+def looks_paywalled(html_bytes: bytes, *, scan_bytes: int = DEFAULT_PAYWALL_SCAN_BYTES) -> bool:
+    # Paywall markup and copy show up in the head/first screen; don't scan whole pages.
+    if 0 < scan_bytes < len(html_bytes):
+        html_bytes = html_bytes[:scan_bytes]
+    lowered = html_bytes.lower()
+    if not any(literal in lowered for literal in PAYWALL_LITERALS):
+        return False
+    return PAYWALL_RE.search(lowered) is not None
+
+
+def write_results_json(out_path: Path, jsonl_path: Path, *, generated_at: str) -> None:
+    """Write {"generated_at", "results"} as indent=2, sort_keys JSON, one JSONL record at a time.
+
+    Byte-for-byte what json.dumps(data, indent=2, sort_keys=True) produces, without
+    loading every record first.
+    """
+    with out_path.open("w", encoding="utf-8") as out, jsonl_path.open("r", encoding="utf-8") as src:
+        out.write('{\n  "generated_at": ' + json.dumps(generated_at) + ',\n  "results": [')
+        sep = "\n    "
+        for line in src:
+            rec = json.loads(line)
+            out.write(sep + json.dumps(rec, indent=2, sort_keys=True).replace("\n", "\n    "))
+            sep = ",\n    "
+        out.write("]\n}" if sep == "\n    " else "\n  ]\n}")
 
 
 async def run(args: argparse.Namespace) -> int:
     seeds = read_seeds(args.seeds)
     denied = read_denylist(args.denylist)
     denied_paywalled = read_denylist(args.denylist_paywalled)
-    seeds = [s for s in seeds if not is_denied(s, denied)]
-    seeds = [s for s in seeds if not is_denied(s, denied_paywalled)]
+    deny_re = compile_denylist(denied + denied_paywalled)
+    seeds = [s for s in seeds if not matches_denylist(s, deny_re)]
 
     ua = UA_PROFILES.get(args.ua_profile, "")
     if not ua:
@@ -614,15 +1046,14 @@ async def run(args: argparse.Namespace) -> int:
         max_bytes=args.max_bytes,
         concurrency=args.concurrency,
         respect_robots=not args.ignore_robots,
+        refetch_errors=args.refetch_errors,
     )
 
-    results: list[dict[str, Any]] = []
-
     # Fan out per-site tasks; per-domain throttling keeps it polite.
+    # Article samples are shared so an article listed in several feeds is fetched once.
+    article_memo: ArticleMemo = {}
     tasks = []
     for s in seeds[: args.max_sites]:
-        if is_denied(s, denied):
-            continue
         tasks.append(
             asyncio.create_task(
                 discover_for_site(
@@ -631,58 +1062,66 @@ async def run(args: argparse.Namespace) -> int:
                     sample_items=args.sample,
                     fetch_articles=not args.no_fetch_articles,
                     max_articles_per_feed=args.max_articles_per_feed,
+                    article_memo=article_memo,
+                    head_cap_bytes=args.head_cap_bytes,
+                    paywall_scan_bytes=args.paywall_scan_bytes,
                 )
             )
         )
-    for t in asyncio.as_completed(tasks):
-        rec = await t
-        if rec:
-            # Final filter: strip denied feeds/items if they slipped in via redirects.
-            rec["feeds"] = [
-                f
-                for f in (rec.get("feeds") or [])
-                if not is_denied(f.get("feed_url") or "", denied)
-                and not is_denied(f.get("feed_url") or "", denied_paywalled)
-            ]
-            for f in rec["feeds"]:
-                # Strip paywalled items (either via denylist or heuristic author-extraction fetch).
-                f["items"] = [
-                    it
-                    for it in (f.get("items") or [])
-                    if not is_denied(it.get("url") or "", denied)
-                    and not is_denied(it.get("url") or "", denied_paywalled)
-                    and not bool(it.get("paywalled"))
+    # Stream finished sites to JSONL as they complete instead of holding them all;
+    # the pretty JSON is assembled from it afterwards.
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    jsonl_path = out_path.with_suffix(".jsonl")
+    n_results = 0
+    with jsonl_path.open("w", encoding="utf-8", buffering=1) as jf:
+        for t in asyncio.as_completed(tasks):
+            rec = await t
+            if rec:
+                # Final filter: strip denied feeds/items if they slipped in via redirects.
+                rec["feeds"] = [
+                    f
+                    for f in (rec.get("feeds") or [])
+                    if not matches_denylist(f.get("feed_url") or "", deny_re)
                 ]
-            # Drop feeds that appear mostly paywalled in sampled article fetches.
-            rec["feeds"] = [
-                f
-                for f in rec["feeds"]
-                if not (
-                    (f.get("paywalled_sampled") is not None)
-                    and (f.get("fetched_sampled") is not None)
-                    and (
-                        (int(f.get("paywalled_sampled") or 0) + int(f.get("fetched_sampled") or 0)) > 0
-                    )
-                    and (
-                        (int(f.get("paywalled_sampled") or 0) / float(int(f.get("paywalled_sampled") or 0) + int(f.get("fetched_sampled") or 0)))
-                        > float(args.max_paywall_ratio)
+                for f in rec["feeds"]:
+                    # Strip paywalled items (either via denylist or heuristic author-extraction fetch).
+                    f["items"] = [
+                        it
+                        for it in (f.get("items") or [])
+                        if not matches_denylist(it.get("url") or "", deny_re)
+                        and not bool(it.get("paywalled"))
+                    ]
+                # Drop feeds that appear mostly paywalled in sampled article fetches.
+                rec["feeds"] = [
+                    f
+                    for f in rec["feeds"]
+                    if not (
+                        (f.get("paywalled_sampled") is not None)
+                        and (f.get("fetched_sampled") is not None)
+                        and (
+                            (int(f.get("paywalled_sampled") or 0) + int(f.get("fetched_sampled") or 0)) > 0
+                        )
+                        and (
+                            (int(f.get("paywalled_sampled") or 0) / float(int(f.get("paywalled_sampled") or 0) + int(f.get("fetched_sampled") or 0)))
+                            > float(args.max_paywall_ratio)
+                        )
                     )
-                )
-            ]
-            results.append(rec)
+                ]
+                jf.write(json.dumps(rec, sort_keys=True) + "\n")
+                n_results += 1
+    fetcher.close()
+    cache.close()
 
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    data = {"generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "results": results}
-    out_path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
-    print(f"wrote {out_path} ({len(results)} sites)")
+    write_results_json(out_path, jsonl_path, generated_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+    print(f"wrote {out_path} ({n_results} sites)")
     return 0
 
 
 def build_parser() -> argparse.ArgumentParser:
     ap = argparse.ArgumentParser(description="Discover RSS/Atom feeds and sample recent items (polite + cached).")
     ap.add_argument("--seeds", default="docs/source_discovery/seed_urls.txt", help="Seed list file (one URL per line)")
-    ap.add_argument("--out", default="docs/source_discovery/discovered_sources.json", help="Output JSON path")
+    ap.add_argument("--out", default="docs/source_discovery/discovered_sources.json", help="Output JSON path (per-site records also stream to a .jsonl beside it)")
     ap.add_argument("--cache-dir", default="data/cache/source_discovery", help="Cache directory (gitignored)")
     ap.add_argument("--cache-ttl-hours", type=float, default=24.0, help="Cache TTL (hours)")
     ap.add_argument(
@@ -711,6 +1150,18 @@ def build_parser() -> argparse.ArgumentParser:
     ap.add_argument("--concurrency", type=int, default=4, help="Max concurrent in-flight requests (overall)")
     ap.add_argument("--max-sites", type=int, default=200, help="Max sites to process from the seeds list")
     ap.add_argument("--max-bytes", type=int, default=2_000_000, help="Max bytes per response to store (default 2MB)")
+    ap.add_argument(
+        "--head-cap-bytes",
+        type=int,
+        default=DEFAULT_HEAD_CAP_BYTES,
+        help="Only scan this many leading bytes of a homepage for feed <link> tags (0 = whole page)",
+    )
+    ap.add_argument(
+        "--paywall-scan-bytes",
+        type=int,
+        default=DEFAULT_PAYWALL_SCAN_BYTES,
+        help="Only scan this many leading bytes of an article for paywall markers (0 = whole page)",
+    )
 
     ap.add_argument(
         "--ua-profile",
@@ -719,6 +1170,11 @@ def build_parser() -> argparse.ArgumentParser:
         help="User-Agent profile to use (matches common browser UA strings)",
     )
     ap.add_argument("--ignore-robots", action="store_true", help="Ignore robots.txt (not recommended)")
+    ap.add_argument(
+        "--refetch-errors",
+        action="store_true",
+        help="Refetch URLs that recently failed with 3xx/403/404/410 instead of replaying the cached error",
+    )
     return ap
 
 
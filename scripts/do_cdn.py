@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 import argparse
+import http.client
 import json
 import os
 import sys
 import urllib.error
+import urllib.parse
 import urllib.request
 from dataclasses import dataclass
 
@@ -41,6 +43,59 @@ def do_request(method: str, path: str, *, payload: dict | None = None) -> HttpRe
         data = json.dumps(payload).encode("utf-8")
         headers["Content-Type"] = "application/json"
 
+    try:
+        if urllib.request.getproxies().get("https"):
+            return _urlopen_request(method, url, data=data, headers=headers)
+        return _pooled_request(method, url, data=data, headers=headers)
+    except Exception as e:
+        raise SystemExit(f"request failed: {method} {url}: {e}") from e
+
+
+# One kept-alive connection to the API host for the whole invocation, instead of
+# a fresh TCP+TLS handshake per call (set-domain alone makes 3-4 calls).
+# http.client sets TCP_NODELAY in connect(), so small JSON requests aren't held
+# back by Nagle's algorithm.
+_API_CONN: http.client.HTTPSConnection | None = None
+
+
+def _api_conn() -> http.client.HTTPSConnection:
+    global _API_CONN
+    if _API_CONN is None:
+        _API_CONN = http.client.HTTPSConnection(urllib.parse.urlsplit(API_BASE).netloc, timeout=30)
+    return _API_CONN
+
+
+def _exchange(conn: http.client.HTTPConnection, method: str, target: str, *, data: bytes | None, headers: dict[str, str]) -> HttpResult:
+    try:
+        conn.request(method, target, body=data, headers=headers)
+        resp = conn.getresponse()
+        return HttpResult(status=resp.status, body=resp.read())
+    except Exception:
+        conn.close()
+        raise
+
+
+# Only idempotent calls are resent after a reset: the API may already have acted on
+# the first attempt, and a repeated POST /certificates would create a duplicate cert.
+_RETRYABLE_METHODS = frozenset({"GET", "PUT", "DELETE"})
+
+
+def _pooled_request(method: str, url: str, *, data: bytes | None, headers: dict[str, str]) -> HttpResult:
+    parts = urllib.parse.urlsplit(url)
+    target = parts.path + (f"?{parts.query}" if parts.query else "")
+    conn = _api_conn()
+    reused = conn.sock is not None
+    try:
+        return _exchange(conn, method, target, data=data, headers=headers)
+    except (ConnectionResetError, BrokenPipeError):
+        if not reused or method not in _RETRYABLE_METHODS:
+            raise
+    # The API dropped our idle keep-alive connection; retry once on a fresh one.
+    return _exchange(conn, method, target, data=data, headers=headers)
+
+
+def _urlopen_request(method: str, url: str, *, data: bytes | None, headers: dict[str, str]) -> HttpResult:
+    # Proxied environments keep urllib's proxy handling.
     req = urllib.request.Request(url, data=data, headers=headers, method=method)
     try:
         with urllib.request.urlopen(req, timeout=30) as resp:
@@ -48,8 +103,6 @@ def do_request(method: str, path: str, *, payload: dict | None = None) -> HttpRe
     except urllib.error.HTTPError as e:
         body = e.read() if hasattr(e, "read") else b""
         return HttpResult(status=getattr(e, "code", 0) or 0, body=body)
-    except Exception as e:
-        raise SystemExit(f"request failed: {method} {url}: {e}") from e
 
 
 def parse_json(res: HttpResult) -> dict:
@@ -162,6 +215,9 @@ def cmd_list(args: argparse.Namespace) -> int:
 
 
 def cmd_set_domain(args: argparse.Namespace) -> int:
+    # Kept sequential on purpose: each call needs the previous result, and the
+    # certificate must not be created until the endpoint lookup has succeeded.
+    # Round trips already share one kept-alive connection (see _api_conn).
     if args.endpoint_id:
         ep = require_ok(do_request("GET", f"/cdn/endpoints/{args.endpoint_id}"), context="get cdn endpoint").get("endpoint") or {}
     else:
@@ -7,16 +7,24 @@ import json
 import mimetypes
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import urlparse
 
 import boto3
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # optional; json gives the same bytes, just slower
+    orjson = None
+
 
 @dataclass(frozen=True)
 class ManifestFile:
@@ -33,9 +41,14 @@ def utc_version() -> str:
 
 
 def sha256_hex(path: Path) -> tuple[str, int]:
-    h = hashlib.sha256()
-    size = 0
     with path.open("rb") as f:
+        if sys.version_info >= (3, 11):
+            # Read loop runs in C with the GIL released around update().
+            h = hashlib.file_digest(f, "sha256")
+            size = os.fstat(f.fileno()).st_size
+            return h.hexdigest(), size
+        h = hashlib.sha256()
+        size = 0
         while True:
             chunk = f.read(1024 * 1024)
             if not chunk:
@@ -45,25 +58,131 @@ def sha256_hex(path: Path) -> tuple[str, int]:
     return h.hexdigest(), size
 
 
+def load_hash_cache(path: Path | None) -> dict[str, dict]:
+    if path is None:
+        return {}
+    try:
+        data = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_hash_cache(path: Path | None, cache: dict[str, dict]) -> None:
+    # Best effort: a missing cache only costs a rehash next time.
+    if path is None:
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(cache, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def cached_hash_entry(cache: dict[str, dict], rel: str, st: os.stat_result) -> dict | None:
+    """The cached {size, mtime_ns, sha256} entry for `rel` if size and mtime_ns still match."""
+    entry = cache.get(rel)
+    if (
+        isinstance(entry, dict)
+        and entry.get("size") == st.st_size
+        and entry.get("mtime_ns") == st.st_mtime_ns
+        and isinstance(entry.get("sha256"), str)
+    ):
+        return entry
+    return None
+
+
+def manifest_json(manifest: dict) -> bytes:
+    """json.dumps(manifest, indent=2, sort_keys=True) as UTF-8 bytes, via orjson when installed."""
+    if orjson is not None:
+        out = orjson.dumps(manifest, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        # orjson writes non-ASCII and DEL raw where json escapes them (DEL as \u007f);
+        # only take its output when neither occurs, so the bytes are the same.
+        if out.isascii() and b"\x7f" not in out:
+            return out
+    return json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+
+
 def iter_files(site_dir: Path) -> list[Path]:
+    # scandir walk with the same results as rglob("*") + is_file(): dirent types
+    # avoid a stat per entry, symlinked files count, symlinked dirs aren't entered
+    # and unreadable dirs are skipped.
     files: list[Path] = []
-    for p in site_dir.rglob("*"):
-        if p.is_file():
-            files.append(p)
+    stack = [os.fspath(site_dir)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        files.append(Path(entry.path))
+        except PermissionError:
+            continue
     return sorted(files)
 
 
 def guess_content_type(key: str) -> str:
+    # mimetypes only looks at the suffixes of the last path component, so memoize
+    # on those ("x.tar.gz" -> ".tar.gz"). Keys with ":" may parse as URLs; skip the memo.
+    if ":" in key:
+        return _guess_content_type(key)
+    name = key.rpartition("/")[2].lstrip(".")
+    dot = name.find(".")
+    return _guess_content_type("f" + name[dot:] if dot >= 0 else "f")
+
+
+@lru_cache(maxsize=4096)
+def _guess_content_type(key: str) -> str:
     ct, _ = mimetypes.guess_type(key)
     return ct or "application/octet-stream"
 
 
-def s3_client(endpoint_url: str | None, region: str, addressing_style: str) -> boto3.client:
+CACHE_NO_CACHE = "no-cache, must-revalidate"
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_DEFAULT = "public, max-age=604800"
+
+
+def site_cache_control(rel: str) -> str:
+    # Cache policy: HTML and JSON should revalidate; static assets can be long-lived.
+    if rel.endswith((".html", ".json")):
+        return CACHE_NO_CACHE
+    if rel.startswith("static/"):
+        return CACHE_IMMUTABLE
+    return CACHE_DEFAULT
+
+
+def s3_client(endpoint_url: str | None, region: str, addressing_style: str, *, workers: int = 16) -> boto3.client:
     # S3-compatible services often need signature v4.
-    cfg = Config(signature_version="s3v4", s3={"addressing_style": addressing_style})
+    # Size the urllib3 pool above the worker count so concurrent HEAD/PUTs reuse
+    # kept-alive connections instead of churning TCP+TLS handshakes. (botocore
+    # already sets TCP_NODELAY on these sockets; tcp_keepalive adds SO_KEEPALIVE.)
+    cfg = Config(
+        signature_version="s3v4",
+        s3={"addressing_style": addressing_style},
+        max_pool_connections=max(32, workers * 2),
+        retries={"max_attempts": 5, "mode": "adaptive"},
+        tcp_keepalive=True,
+        connect_timeout=5,
+        read_timeout=60,
+    )
     return boto3.client("s3", endpoint_url=endpoint_url or None, region_name=region, config=cfg)
 
 
+def transfer_manager(s3, *, workers: int = 16):
+    # Files above 8 MiB go up as parallel 8 MiB multipart parts (each retried on
+    # its own); smaller files stay single PUTs. Concurrency covers the worker pool.
+    cfg = TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=8 * 1024 * 1024,
+        max_concurrency=max(8, workers),
+        use_threads=True,
+    )
+    return create_transfer_manager(s3, cfg)
+
+
 def object_exists(s3, bucket: str, key: str) -> bool:
     try:
         s3.head_object(Bucket=bucket, Key=key)
@@ -75,7 +194,24 @@ def object_exists(s3, bucket: str, key: str) -> bool:
         raise
 
 
+# Flipped to False the first time the bucket rejects an ACL and the same request
+# then succeeds without one, so later uploads stop sending ACLs that would only
+# fail and be retried.
+_ACL_SUPPORTED: bool | None = None
+
+
+def usable_acl(acl: str | None) -> str | None:
+    return acl if _ACL_SUPPORTED is not False else None
+
+
+def mark_acl_unsupported() -> None:
+    global _ACL_SUPPORTED
+    _ACL_SUPPORTED = False
+
+
 def ensure_object_acl(s3, bucket: str, key: str, acl: str) -> None:
+    if usable_acl(acl) is None:
+        return
     try:
         s3.put_object_acl(Bucket=bucket, Key=key, ACL=acl)
     except ClientError as e:
@@ -91,7 +227,7 @@ def ensure_object_acl(s3, bucket: str, key: str, acl: str) -> None:
 
 
 def upload_file(
-    s3,
+    transfer,
     bucket: str,
     key: str,
     path: Path,
@@ -99,6 +235,7 @@ def upload_file(
     cache_control: str,
     acl: str | None,
 ) -> None:
+    acl = usable_acl(acl)
     extra: dict[str, object] = {
         "ContentType": guess_content_type(key),
         "CacheControl": cache_control,
@@ -107,16 +244,15 @@ def upload_file(
         extra["ACL"] = acl
 
     try:
-        with path.open("rb") as f:
-            s3.put_object(Bucket=bucket, Key=key, Body=f, **extra)
+        transfer.upload(str(path), bucket, key, extra_args=extra).result()
     except ClientError as e:
         code = (e.response.get("Error") or {}).get("Code") or ""
         msg = (e.response.get("Error") or {}).get("Message") or ""
         acl_unsupported = code in {"AccessControlListNotSupported", "InvalidRequest", "AccessDenied"} or "acl" in msg.lower()
         if acl and acl_unsupported:
             extra.pop("ACL", None)
-            with path.open("rb") as f:
-                s3.put_object(Bucket=bucket, Key=key, Body=f, **extra)
+            transfer.upload(str(path), bucket, key, extra_args=extra).result()
+            mark_acl_unsupported()
             return
         raise
 
@@ -131,6 +267,7 @@ def upload_bytes(
     cache_control: str,
     acl: str | None,
 ) -> None:
+    acl = usable_acl(acl)
     extra: dict[str, object] = {
         "Bucket": bucket,
         "Key": key,
@@ -150,6 +287,7 @@ def upload_bytes(
         if acl and acl_unsupported:
             extra.pop("ACL", None)
             s3.put_object(**extra)
+            mark_acl_unsupported()
             return
         raise
 
@@ -167,55 +305,105 @@ def head_object_sha256(s3, bucket: str, key: str) -> str | None:
     return sha
 
 
-def upload_site_tree(
+def upload_site_file(
     s3,
     bucket: str,
-    site_dir: Path,
+    mf: ManifestFile,
+    f: Path,
     *,
     acl: str | None,
-) -> int:
-    uploaded = 0
-    for f in iter_files(site_dir):
-        rel = f.relative_to(site_dir).as_posix()
-        digest, _size = sha256_hex(f)
-
-        # Cache policy: HTML and JSON should revalidate; static assets can be long-lived.
-        if rel.endswith((".html", ".json")):
-            cache_control = "no-cache, must-revalidate"
-        elif rel.startswith("static/"):
-            cache_control = "public, max-age=31536000, immutable"
+    transfer,
+    copy_from: str | None = None,
+) -> bool:
+    """HEAD + conditional PUT of one site file under its manifest path; True if uploaded.
+
+    With `copy_from` (a key already holding the same content), the object is
+    copied server-side instead of sending the body again.
+    """
+    rel = mf.path
+    digest = mf.hash
+
+    cache_control = site_cache_control(rel)
+
+    # A HEAD rather than a conditional PUT: IfNoneMatch="*" would also skip files
+    # whose content changed under the same key, and a 412 only arrives after the
+    # body has been sent. Not every S3-compatible origin honours it either.
+    existing = head_object_sha256(s3, bucket, rel)
+    if existing == digest:
+        return False
+
+    extra: dict[str, object] = {
+        "ContentType": guess_content_type(rel),
+        "CacheControl": cache_control,
+        "Metadata": {"sha256": digest},
+    }
+    acl = usable_acl(acl)
+    if acl:
+        extra["ACL"] = acl
+
+    def send() -> None:
+        if copy_from is None:
+            transfer.upload(str(f), bucket, rel, extra_args=extra).result()
         else:
-            cache_control = "public, max-age=604800"
+            copy_extra = {**extra, "MetadataDirective": "REPLACE"}
+            transfer.copy({"Bucket": bucket, "Key": copy_from}, bucket, rel, extra_args=copy_extra).result()
 
-        existing = head_object_sha256(s3, bucket, rel)
-        if existing == digest:
-            continue
+    try:
+        send()
+    except ClientError as e:
+        code = (e.response.get("Error") or {}).get("Code") or ""
+        msg = (e.response.get("Error") or {}).get("Message") or ""
+        acl_unsupported = code in {"AccessControlListNotSupported", "InvalidRequest", "AccessDenied"} or "acl" in msg.lower()
+        if acl and acl_unsupported:
+            extra.pop("ACL", None)
+            send()
+            mark_acl_unsupported()
+        else:
+            raise
 
-        extra: dict[str, object] = {
-            "ContentType": guess_content_type(rel),
-            "CacheControl": cache_control,
-            "Metadata": {"sha256": digest},
-        }
-        if acl:
-            extra["ACL"] = acl
+    return True
 
-        try:
-            with f.open("rb") as fp:
-                s3.put_object(Bucket=bucket, Key=rel, Body=fp, **extra)
-        except ClientError as e:
-            code = (e.response.get("Error") or {}).get("Code") or ""
-            msg = (e.response.get("Error") or {}).get("Message") or ""
-            acl_unsupported = code in {"AccessControlListNotSupported", "InvalidRequest", "AccessDenied"} or "acl" in msg.lower()
-            if acl and acl_unsupported:
-                extra.pop("ACL", None)
-                with f.open("rb") as fp:
-                    s3.put_object(Bucket=bucket, Key=rel, Body=fp, **extra)
-            else:
-                raise
 
-        uploaded += 1
+def upload_site_tree(
+    s3,
+    bucket: str,
+    files: list[ManifestFile],
+    paths: dict[str, Path],
+    *,
+    acl: str | None,
+    transfer,
+    workers: int = 16,
+) -> int:
+    # Reuses the manifest walk and digests from main(); nothing is re-read here
+    # except by the PUT itself. Paths sharing content are handled as one group:
+    # the first goes up normally, the rest are server-side copies of it.
+    # boto3 clients are thread-safe, so groups' HEAD/PUT round trips overlap.
+    groups: dict[str, list[ManifestFile]] = {}
+    for mf in files:
+        groups.setdefault(mf.hash, []).append(mf)
+
+    def upload_group(group: list[ManifestFile]) -> int:
+        first, *dupes = group
+        uploaded = int(upload_site_file(s3, bucket, first, paths[first.path], acl=acl, transfer=transfer))
+        for mf in dupes:
+            uploaded += upload_site_file(
+                s3, bucket, mf, paths[mf.path], acl=acl, transfer=transfer, copy_from=first.path
+            )
+        return uploaded
 
-    return uploaded
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return sum(pool.map(upload_group, groups.values()))
+
+
+def publish_object(s3, bucket: str, digest: str, src_path: Path, *, acl: str | None, transfer) -> bool:
+    """Upload objects/<digest> unless it already exists; True if uploaded."""
+    key = f"objects/{digest}"
+    if object_exists(s3, bucket, key):
+        if acl:
+            ensure_object_acl(s3, bucket, key, acl)
+        return False
+    upload_file(transfer, bucket, key, src_path, cache_control=CACHE_IMMUTABLE, acl=acl)
+    return True
 
 
 def main() -> int:
@@ -263,6 +451,24 @@ def main() -> int:
         default=os.environ.get("PUBLISH_SITE_TREE", "").strip() == "1",
         help="Also upload the static site tree to normal paths (index.html, /static/...), so object storage/CDNs can serve the site directly.",
     )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("PUBLISH_WORKERS", "") or 16),
+        help="Concurrent HEAD/PUT workers (default: 16, or env PUBLISH_WORKERS).",
+    )
+    ap.add_argument(
+        "--hash-processes",
+        type=int,
+        default=int(os.environ.get("PUBLISH_HASH_PROCESSES", "") or os.cpu_count() or 1),
+        help="Processes used to sha256 new/changed files (default: CPU count, or env PUBLISH_HASH_PROCESSES).",
+    )
+    ap.add_argument(
+        "--hash-cache",
+        default=os.environ.get("PUBLISH_HASH_CACHE", ""),
+        help="JSON cache of (size, mtime) -> sha256 so unchanged files aren't rehashed "
+        "(default: .publish_cache.json next to --site-dir; 'none' disables).",
+    )
     args = ap.parse_args()
 
     site_dir = Path(args.site_dir).resolve()
@@ -283,16 +489,40 @@ def main() -> int:
         acl = None
 
     files: list[ManifestFile] = []
+    paths: dict[str, Path] = {}
     objects_to_upload: dict[str, Path] = {}
 
-    for f in iter_files(site_dir):
-        rel = f.relative_to(site_dir).as_posix()
-        digest, size = sha256_hex(f)
+    workers = max(1, args.workers)
+    hash_cache_arg = args.hash_cache.strip()
+    if hash_cache_arg.lower() == "none":
+        hash_cache_path = None
+    else:
+        hash_cache_path = Path(hash_cache_arg) if hash_cache_arg else site_dir.parent / ".publish_cache.json"
+    hash_cache = load_hash_cache(hash_cache_path)
+    new_hash_cache: dict[str, dict] = {}
+
+    site_files = iter_files(site_dir)
+    rels = [f.relative_to(site_dir).as_posix() for f in site_files]
+    stats = [f.stat() for f in site_files]
+    entries = [cached_hash_entry(hash_cache, rel, st) for rel, st in zip(rels, stats)]
+    misses = [i for i, entry in enumerate(entries) if entry is None]
+    if misses:
+        # SHA-256 is CPU-bound; spread cache misses across cores.
+        procs = min(len(misses), max(1, args.hash_processes))
+        with ProcessPoolExecutor(max_workers=procs) as pool:
+            hashed = pool.map(sha256_hex, [site_files[i] for i in misses], chunksize=max(1, len(misses) // (procs * 4)))
+            for i, (digest, size) in zip(misses, hashed):
+                entries[i] = {"size": size, "mtime_ns": stats[i].st_mtime_ns, "sha256": digest}
+    for f, rel, entry in zip(site_files, rels, entries):
+        digest, size = entry["sha256"], entry["size"]
         files.append(ManifestFile(path=rel, hash=digest, size=size))
+        paths[rel] = f
         objects_to_upload.setdefault(digest, f)
+        new_hash_cache[rel] = entry
+    save_hash_cache(hash_cache_path, new_hash_cache)
 
     manifest = {"version": version, "files": [mf.__dict__ for mf in files]}
-    manifest_bytes = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+    manifest_bytes = manifest_json(manifest)
 
     if endpoint_url:
         parsed = urlparse(endpoint_url)
@@ -327,40 +557,40 @@ def main() -> int:
             )
             return 2
 
-    s3 = s3_client(endpoint_url=endpoint_url, region=region, addressing_style=args.addressing_style)
+    s3 = s3_client(endpoint_url=endpoint_url, region=region, addressing_style=args.addressing_style, workers=workers)
 
-    uploaded_objects = 0
-    for digest, src_path in objects_to_upload.items():
-        key = f"objects/{digest}"
-        if object_exists(s3, bucket, key):
-            if acl:
-                ensure_object_acl(s3, bucket, key, acl)
-            continue
-        upload_file(s3, bucket, key, src_path, cache_control="public, max-age=31536000, immutable", acl=acl)
-        uploaded_objects += 1
-
-    upload_bytes(
-        s3,
-        bucket,
-        "manifests/latest.json",
-        manifest_bytes,
-        content_type="application/json",
-        cache_control="no-cache, must-revalidate",
-        acl=acl,
-    )
-    upload_bytes(
-        s3,
-        bucket,
-        f"manifests/{version}.json",
-        manifest_bytes,
-        content_type="application/json",
-        cache_control="public, max-age=31536000, immutable",
-        acl=acl,
-    )
+    transfer = transfer_manager(s3, workers=workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(
+                lambda item: publish_object(s3, bucket, item[0], item[1], acl=acl, transfer=transfer), objects_to_upload.items()
+            )
+            uploaded_objects = sum(1 for uploaded in results if uploaded)
+
+        upload_bytes(
+            s3,
+            bucket,
+            "manifests/latest.json",
+            manifest_bytes,
+            content_type="application/json",
+            cache_control=CACHE_NO_CACHE,
+            acl=acl,
+        )
+        upload_bytes(
+            s3,
+            bucket,
+            f"manifests/{version}.json",
+            manifest_bytes,
+            content_type="application/json",
+            cache_control=CACHE_IMMUTABLE,
+            acl=acl,
+        )
 
-    uploaded_site = 0
-    if args.upload_site_tree:
-        uploaded_site = upload_site_tree(s3, bucket, site_dir, acl=acl)
+        uploaded_site = 0
+        if args.upload_site_tree:
+            uploaded_site = upload_site_tree(s3, bucket, files, paths, acl=acl, transfer=transfer, workers=workers)
+    finally:
+        transfer.shutdown()
 
     origin = args.origin_base_url.strip()
     if origin and not origin.startswith(("http://", "https://")):
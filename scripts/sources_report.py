@@ -4,12 +4,40 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import os
+import re
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterator
+
+
+FIELDS = ("source", "source_url", "feed_url", "title", "url", "author", "published")
+
+
+def iter_results(path: Path) -> Iterator[dict]:
+    """Yield discovery records one at a time.
+
+    A .jsonl (the per-record sidecar discover_sources writes beside its JSON) is streamed line
+    by line; anything else is read as the {"generated_at", "results"} JSON document.
+    """
+    if path.suffix != ".jsonl":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        yield from data.get("results") or []
+        return
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
 
 
 def main() -> int:
     ap = argparse.ArgumentParser(description="Summarize discovered sources into a CSV (author/source/url/article).")
-    ap.add_argument("--in", dest="inp", default="docs/source_discovery/discovered_sources.json")
+    ap.add_argument(
+        "--in",
+        dest="inp",
+        default="docs/source_discovery/discovered_sources.json",
+        help="discover_sources output JSON, or its .jsonl sidecar to stream records",
+    )
     ap.add_argument("--out", dest="outp", default="docs/source_discovery/discovered_articles.csv")
     ap.add_argument(
         "--denylist",
@@ -23,8 +51,7 @@ def main() -> int:
     )
     args = ap.parse_args()
 
-    data = json.loads(Path(args.inp).read_text(encoding="utf-8"))
-    results = data.get("results") or []
+    results = iter_results(Path(args.inp))
 
     def read_deny(path: str) -> list[str]:
         p = Path(path)
@@ -35,49 +62,55 @@ def main() -> int:
     denied = read_deny(args.denylist)
     denied_paywalled = read_deny(args.denylist_paywalled)
 
+    # One alternation over both lists: each URL is scanned once, not once per entry.
+    deny_terms = sorted({d for d in denied + denied_paywalled if d})
+    deny_search = re.compile("|".join(map(re.escape, deny_terms))).search if deny_terms else None
+
+    # Site and feed URLs recur across records; bounded so item URLs can't grow it without limit.
+    @lru_cache(maxsize=4096)
     def is_denied(u: str) -> bool:
-        u = (u or "").lower()
-        return any(d and d in u for d in denied) or any(d and d in u for d in denied_paywalled)
-
-    rows: list[dict[str, str]] = []
-    for r in results:
-        site = r.get("site_url") or ""
-        if is_denied(site):
-            continue
-        for f in r.get("feeds") or []:
-            feed_title = f.get("feed_title") or ""
-            feed_url = f.get("feed_url") or ""
-            if is_denied(feed_url):
-                continue
-            for it in f.get("items") or []:
-                if it.get("paywalled"):
-                    continue
-                if is_denied(it.get("url") or ""):
-                    continue
-                rows.append(
-                    {
-                        "source": feed_title or site,
-                        "source_url": site,
-                        "feed_url": feed_url,
-                        "title": (it.get("title") or ""),
-                        "url": (it.get("url") or ""),
-                        "author": (it.get("author") or ""),
-                        "published": (it.get("published") or ""),
-                    }
-                )
+        return deny_search is not None and deny_search(u.lower()) is not None
 
     out_path = Path(args.outp)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(
-            f,
-            fieldnames=["source", "source_url", "feed_url", "title", "url", "author", "published"],
-        )
-        w.writeheader()
-        for row in rows:
-            w.writerow(row)
-
-    print(f"wrote {out_path} ({len(rows)} rows)")
+    # Rows are written as they're produced; go through a temp file so a bad input
+    # doesn't leave a truncated report behind.
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    n_rows = 0
+    with tmp_path.open("w", newline="", encoding="utf-8") as out:
+        w = csv.writer(out)
+        w.writerow(FIELDS)
+        for r in results:
+            site = r.get("site_url") or ""
+            if is_denied(site):
+                continue
+            for f in r.get("feeds") or []:
+                feed_title = f.get("feed_title") or ""
+                feed_url = f.get("feed_url") or ""
+                if is_denied(feed_url):
+                    continue
+                source = feed_title or site
+                for it in f.get("items") or []:
+                    if it.get("paywalled"):
+                        continue
+                    url = it.get("url") or ""
+                    if is_denied(url):
+                        continue
+                    w.writerow(
+                        (
+                            source,
+                            site,
+                            feed_url,
+                            it.get("title") or "",
+                            url,
+                            it.get("author") or "",
+                            it.get("published") or "",
+                        )
+                    )
+                    n_rows += 1
+    os.replace(tmp_path, out_path)
+
+    print(f"wrote {out_path} ({n_rows} rows)")
     return 0
 
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import hashlib
 import json
+import shutil
 from pathlib import Path
 
 
@@ -31,12 +32,13 @@ def main() -> int:
     expected = sha256_upper(payload)
     (cable_dir / "payload.txt").write_bytes(payload)
     (cable_dir / "payload.sha256").write_text(expected + "\n", encoding="ascii")
-    (cable_dir / "meta.json").write_text(json.dumps({"utc": utc}, indent=2) + "\n", encoding="ascii")
+    meta = json.dumps({"utc": utc}, sort_keys=True, separators=(",", ":"))
+    (cable_dir / "meta.json").write_text(meta + "\n", encoding="ascii")
 
     # Optional: copy a PDF if one exists from the cables build pipeline.
     repo_pdf = Path(__file__).resolve().parents[2] / "cables" / "build" / "pdf" / f"{cable_id}.pdf"
     if repo_pdf.exists():
-        (cable_dir / "cable.pdf").write_bytes(repo_pdf.read_bytes())
+        shutil.copyfile(repo_pdf, cable_dir / "cable.pdf")
 
     print(f"OK: created {cable_dir}")
     print(f"SHA256: {expected}")